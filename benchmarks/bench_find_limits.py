@@ -0,0 +1,28 @@
+"""
+Compare the recursive, vectorized and analytic DataGen.find_limits solvers.
+
+    python benchmarks/bench_find_limits.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data_generator import DataGen
+
+
+def bench(resolution: float, method: str, repeat: int = 5) -> float:
+    """ Best wall time in seconds of one find_limits call.
+    """
+    datagen = DataGen()
+    return min(timeit.repeat(lambda: datagen.find_limits(resolution, method), number=1, repeat=repeat))
+
+
+if __name__ == '__main__':
+    print(f"{'resolution':>10} {'recursive':>12} {'vectorized':>12} {'analytic':>12} {'speedup':>8}")
+    for resolution in (1.0, 0.1, 0.01):
+        recursive = bench(resolution, "recursive", repeat=1 if resolution < 0.1 else 3)
+        vectorized = bench(resolution, "vectorized")
+        analytic = bench(resolution, "analytic")
+        print(f"{resolution:>10} {recursive:>11.4f}s {vectorized:>11.4f}s {analytic:>11.4f}s {recursive / vectorized:>7.1f}x")
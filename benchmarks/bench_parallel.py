@@ -0,0 +1,45 @@
+"""
+Scaling of the shared memory process pool conversion from 1 to N workers.
+
+    python benchmarks/bench_parallel.py [samples] [max_workers]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from parallel_conversion import ParallelConverter
+from pointing_conversion import azel_to_xy_array
+
+
+def bench(converter: ParallelConverter, az: np.ndarray, el: np.ndarray, repeat: int = 3) -> float:
+    """ Best wall time in seconds of one convert call on a warm pool.
+    """
+    converter.convert(az, el)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert(az, el)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    rng = np.random.default_rng(0)
+    az = rng.uniform(0.0, 360.0, samples)
+    el = rng.uniform(0.0, 90.0, samples)
+    start = time.perf_counter()
+    azel_to_xy_array(az, el)
+    serial = time.perf_counter() - start
+    print(f"{samples} samples, in process: {serial:.3f}s, cpu count: {os.cpu_count()}")
+    print(f"{'workers':>8} {'time':>9} {'speedup':>8}")
+    workers = 1
+    while workers <= max_workers:
+        with ParallelConverter(workers, capacity=samples, block_size=-(-samples // (4 * workers))) as converter:
+            elapsed = bench(converter, az, el)
+        print(f"{workers:>8} {elapsed:>8.3f}s {serial / elapsed:>7.2f}x")
+        workers *= 2
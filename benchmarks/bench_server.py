@@ -0,0 +1,67 @@
+"""
+Throughput and latency of the local conversion server under concurrent clients.
+
+    python benchmarks/bench_server.py [clients] [requests_per_client] [in_flight] [--unix]
+
+Starts a server in process on a free localhost port (or a Unix socket), then every client pipelines single sample
+azel2xy requests, keeping at most in_flight of them outstanding. Reports requests per second, latency percentiles and the mean batch size the server coalesced.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from conversion_server import ConversionClient, ConversionServer
+
+
+async def client_run(client: ConversionClient, az: np.ndarray, el: np.ndarray, latencies: list, in_flight: int):
+    slots = asyncio.Semaphore(in_flight)
+
+    async def one(a, e):
+        async with slots:
+            start = time.perf_counter()
+            await client.request('azel2xy', a, e)
+            latencies.append(time.perf_counter() - start)
+    await asyncio.gather(*(one(a, e) for a, e in zip(az.tolist(), el.tolist())))
+
+
+async def bench(clients: int, per_client: int, unix: bool, in_flight: int = 16, window: float = 0.0):
+    server = ConversionServer(window=window)
+    with tempfile.TemporaryDirectory() as directory:
+        if unix:
+            path = os.path.join(directory, 'xy.sock')
+            await server.start_unix(path)
+            connections = [await ConversionClient.connect(path=path) for _ in range(clients)]
+        else:
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            connections = [await ConversionClient.connect(port=port) for _ in range(clients)]
+        rng = np.random.default_rng(0)
+        az = rng.uniform(0.0, 360.0, (clients, per_client))
+        el = rng.uniform(0.0, 90.0, (clients, per_client))
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(client_run(connection, az[i], el[i], latencies, in_flight) for i, connection in enumerate(connections)))
+        elapsed = time.perf_counter() - start
+        for connection in connections:
+            await connection.close()
+        await server.close()
+    latencies = np.array(latencies) * 1e3
+    total = clients * per_client
+    print(f"{clients} clients x {per_client} requests, {in_flight} in flight each, over {'unix socket' if unix else 'tcp'}, window {window * 1e3:.2f} ms")
+    print(f"  {total / elapsed:,.0f} requests/s, {elapsed:.3f}s total")
+    print(f"  latency p50 {np.percentile(latencies, 50):.3f} ms, p99 {np.percentile(latencies, 99):.3f} ms")
+    print(f"  {server.batches} batches, {server.requests / max(server.batches, 1):.1f} requests per batch")
+
+
+if __name__ == '__main__':
+    arguments = [arg for arg in sys.argv[1:] if arg != '--unix']
+    clients = int(arguments[0]) if len(arguments) > 0 else 8
+    per_client = int(arguments[1]) if len(arguments) > 1 else 2000
+    in_flight = int(arguments[2]) if len(arguments) > 2 else 16
+    for window in (0.0, 0.0005):
+        asyncio.run(bench(clients, per_client, '--unix' in sys.argv, in_flight, window))
@@ -0,0 +1,53 @@
+"""
+Cold start time of the headless contour CLI and the modules behind it, each case in a fresh interpreter.
+
+    python benchmarks/bench_startup.py [repeat]
+
+Reports the median wall time per case, and checks the CLI run left tkinter, matplotlib and polars unimported.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+GUI_MODULES = ('tkinter', 'matplotlib', 'polars')
+
+
+def cold_start(code: str, repeat: int) -> float:
+    """ Median wall time in seconds of running code in a new interpreter with src on the path.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=SRC, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'contour.npy')
+        cases = {
+            'interpreter': 'pass',
+            'import numpy': 'import numpy',
+            'import pointing_conversion': 'import pointing_conversion',
+            'import data_generator': 'import data_generator',
+            'import contour_cli': 'import contour_cli',
+            'contour_cli --help': 'import contour_cli; contour_cli.main(["--help"])',
+            'contour_cli default contour': f'import contour_cli; contour_cli.main([{output!r}])',
+            'import plotting_gui': 'import plotting_gui',
+        }
+        print(f"{'case':<32} {'median':>10}")
+        for name, code in cases.items():
+            try:
+                print(f"{name:<32} {cold_start(code, repeat) * 1e3:>8.1f}ms")
+            except subprocess.CalledProcessError:
+                print(f"{name:<32} {'failed':>10}")
+        check = (f'import sys, contour_cli; contour_cli.main([{output!r}]); '
+                 f'print(",".join(m for m in {GUI_MODULES!r} if m in sys.modules))')
+        loaded = subprocess.run([sys.executable, '-c', check], cwd=SRC, check=True, capture_output=True, text=True).stdout.strip()
+        print(f"\nGUI modules imported by the CLI: {loaded or 'none'}")
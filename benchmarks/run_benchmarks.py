@@ -0,0 +1,163 @@
+"""
+Time the pointing_conversion and data_generator hot paths and compare them against a stored baseline.
+
+    python benchmarks/run_benchmarks.py                    # run, write results.json, compare with baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline    # run and replace baseline.json
+    python benchmarks/run_benchmarks.py --quick            # fewer repeats, for a smoke test
+
+Every case reports the best time per call in seconds. A case regresses when it is slower than the baseline by more than
+--threshold (a ratio), the exit status is 1 if any case regresses.
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+import numpy as np
+from data_generator import DataGen
+from mount_model import MountModel
+from offset_axis import OffsetAxisModel
+from pointing_conversion import ENU, ENUBatch, azel_to_xy_array, xy_to_azel_array
+
+BASELINE = os.path.join(HERE, 'baseline.json')
+RESULTS = os.path.join(HERE, 'results.json')
+
+
+def _scalar_loop(method: Callable, args: np.ndarray) -> Callable:
+    """ Build a callable running method(*row) for every row of args.
+    """
+    rows = [tuple(row) for row in args.tolist()]
+
+    def run():
+        for row in rows:
+            method(*row)
+    return run
+
+
+def build_cases() -> Dict[str, Callable]:
+    """ The named benchmark cases, each a callable timed as one call.
+    """
+    rng = np.random.default_rng(2026)
+    cases = {}
+    enu = ENU()
+    for size in (100, 1000):
+        azel = np.column_stack((rng.uniform(0.0, 360.0, size), rng.uniform(0.0, 90.0, size)))
+        xy = np.column_stack((rng.uniform(-90.0, 90.0, size), rng.uniform(-90.0, 90.0, size)))
+        rpy = rng.uniform(-1.0, 1.0, (size, 3))
+        cases[f"ENU.from_azel[n={size}]"] = _scalar_loop(enu.from_azel, azel)
+        cases[f"ENU.from_xy[n={size}]"] = _scalar_loop(enu.from_xy, xy)
+        cases[f"ENU.R_rpy[n={size}]"] = _scalar_loop(enu.R_rpy, rpy)
+    for size in (1000, 100000):
+        az, el = rng.uniform(0.0, 360.0, size), rng.uniform(0.0, 90.0, size)
+        x, y = rng.uniform(-90.0, 90.0, size), rng.uniform(-90.0, 90.0, size)
+        cases[f"ENUBatch.from_azel[n={size}]"] = lambda az=az, el=el: ENUBatch.from_azel(az, el)
+        cases[f"ENUBatch.from_xy[n={size}]"] = lambda x=x, y=y: ENUBatch.from_xy(x, y)
+        az32, el32 = az.astype(np.float32), el.astype(np.float32)
+        cases[f"ENUBatch.from_azel[float32,n={size}]"] = lambda az=az32, el=el32: ENUBatch.from_azel(az, el, dtype=np.float32)
+        model = MountModel.rpy(0.05, -0.02, 0.1).then(MountModel.up(0.2))
+        cases[f"MountModel.correct[n={size}]"] = lambda az=az, el=el, model=model: model.correct(az, el, output='xy')
+        # the offset axis model against the zero offset fast path it extends
+        offset, target_range = OffsetAxisModel(), rng.uniform(100.0, 5000.0, size)
+        cases[f"azel_to_xy_array[n={size}]"] = lambda az=az, el=el: azel_to_xy_array(az, el)
+        cases[f"OffsetAxisModel.azel_to_xy[n={size}]"] = lambda az=az, el=el, r=target_range: offset.azel_to_xy(az, el, r)
+        cases[f"xy_to_azel_array[n={size}]"] = lambda x=x, y=y: xy_to_azel_array(x, y)
+        cases[f"OffsetAxisModel.xy_to_azel[n={size}]"] = lambda x=x, y=y, r=target_range: offset.xy_to_azel(x, y, r)
+
+    datagen = DataGen()
+    cases["DataGen.find_limits[recursive,res=1.0]"] = lambda: datagen.find_limits(1.0, "recursive")
+    cases["DataGen.find_from_point[recursive,res=1.0]"] = lambda: datagen.find_from_point(1.0, "recursive")
+    for resolution in (1.0, 0.1):
+        cases[f"DataGen.find_limits[vectorized,res={resolution}]"] = lambda r=resolution: datagen.find_limits(r, "vectorized")
+        cases[f"DataGen.find_limits[analytic,res={resolution}]"] = lambda r=resolution: datagen.find_limits(r, "analytic")
+        cases[f"DataGen.find_from_point[vectorized,res={resolution}]"] = lambda r=resolution: datagen.find_from_point(r, "vectorized")
+    single = DataGen()
+    single.dtype = np.float32
+    cases["DataGen.find_limits[vectorized,float32,res=0.1]"] = lambda: single.find_limits(0.1, "vectorized")
+    cases["DataGen.find_from_point[vectorized,float32,res=0.1]"] = lambda: single.find_from_point(0.1, "vectorized")
+    cases["DataGen.find_limits[vectorized,adaptive,max_error=0.05]"] = lambda: datagen.find_limits(5.0, "vectorized", max_error=0.05)
+    cases["DataGen.find_from_point[vectorized,adaptive,max_error=0.05]"] = lambda: datagen.find_from_point(5.0, "vectorized", max_error=0.05)
+    for size in (100, 1000):
+        points = np.column_stack((rng.uniform(-90.0, 90.0, size), rng.uniform(-90.0, 90.0, size)))
+        cases[f"DataGen.point_in_polygon[n={size}]"] = _scalar_loop(lambda x, y: datagen.point_in_polygon((x, y)), points)
+    for size in (1000, 100000):
+        x, y = rng.uniform(-90.0, 90.0, size), rng.uniform(-90.0, 90.0, size)
+        cases[f"DataGen.points_in_polygon[n={size}]"] = lambda x=x, y=y: datagen.points_in_polygon(x, y)
+    masks = {'limits': datagen.reachability_mask("limits"), 'polygon': datagen.reachability_mask("polygon")}
+    az, el = rng.uniform(0.0, 360.0, 1000000), rng.uniform(0.0, 90.0, 1000000)
+    for mode, mask in masks.items():
+        cases[f"ReachabilityMask.contains[{mode},n=1000000]"] = lambda mask=mask: mask.contains(az, el)
+    return cases
+
+
+def run(cases: Dict[str, Callable], repeat: int, pattern: Optional[str] = None) -> Dict[str, float]:
+    """ Time every case, best of repeat single calls.
+    """
+    results = {}
+    for name, case in cases.items():
+        if pattern and pattern not in name:
+            continue
+        case()  # warm up
+        results[name] = min(timeit.repeat(case, number=1, repeat=repeat))
+        print(f"{name:<48} {results[name] * 1e3:>10.3f} ms")
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """ Print the ratios against the baseline.
+
+    Returns: the names of the regressed cases.
+    """
+    regressions = []
+    print(f"\n{'case':<48} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"{name:<48} {'-':>10} {seconds * 1e3:>8.3f}ms {'new':>7}")
+            continue
+        ratio = seconds / baseline[name]
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<48} {baseline[name] * 1e3:>8.3f}ms {seconds * 1e3:>8.3f}ms {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def environment() -> dict:
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'system': platform.system(), 'cpu_count': os.cpu_count()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pointing conversion hot paths.")
+    parser.add_argument('--output', default=RESULTS, help="where to write the results JSON")
+    parser.add_argument('--baseline', default=BASELINE, help="the baseline JSON to compare with")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio counted as a regression")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case, the best is kept")
+    parser.add_argument('--quick', action='store_true', help="a single timed run per case")
+    parser.add_argument('-k', dest='pattern', help="only run cases whose name contains this text")
+    args = parser.parse_args(argv)
+
+    results = run(build_cases(), 1 if args.quick else args.repeat, args.pattern)
+    document = {'environment': environment(), 'results': results}
+    with open(args.baseline if args.save_baseline else args.output, 'w') as json_file:
+        json.dump(document, json_file, indent=2, sort_keys=True)
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as json_file:
+        baseline = json.load(json_file)
+    regressions = compare(results, baseline['results'], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.threshold}x the baseline")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+import hashlib
+import os
+import tempfile
+import threading
+import numpy as np
+try:
+    from .data_generator import DataGen
+except ImportError:
+    # run as a script or with src on sys.path
+    from data_generator import DataGen
+
+
+class ContourCache():
+    """
+    Memoize limit contours keyed by the limits, mode, resolution and tolerance that produced them.
+
+    A least recently used in memory layer sits in front of an optional directory of .npy files, one (N, 2) float64 az, el array per key.
+    The memory layer and the counters are guarded by a lock, so a cancelled ContourJob still finishing can share the cache with the next one.
+    """
+
+    def __init__(self, max_entries: int = 32, directory: Optional[str] = None):
+        """
+        Args: the number of contours kept in memory, an optional directory for the on disk store. The directory is created if needed.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(xy: Tuple[Tuple[float, float], Tuple[float, float]], polygon: Optional[Sequence[Tuple[float, float]]],
+            mode: str, resolution: float, tolerance: float, method: str) -> str:
+        """
+        Build the cache key, only the geometry the mode uses is part of the key.
+
+        Returns: a hex digest string that is also the on disk file name.
+        """
+        if mode == "limits":
+            geometry = np.asarray(xy, dtype=np.double).ravel()
+        elif mode == "polygon":
+            geometry = np.asarray(polygon, dtype=np.double).ravel()
+        else:
+            raise ValueError(f"unknown contour mode: {mode}")
+        digest = hashlib.sha1(f"{mode}|{method}|{float(resolution)!r}|{float(tolerance)!r}|".encode())
+        digest.update(geometry.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a contour, memory first and then disk.
+
+        Returns: the (N, 2) az, el array or None on a miss. Arrays are read only since they are shared.
+        """
+        with self._lock:
+            contour = self._memory.get(key)
+            if contour is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return contour
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            contour = np.load(path)
+            with self._lock:
+                self.disk_hits += 1
+                return self._remember(key, contour)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, contour: np.ndarray, copy: bool = True) -> np.ndarray:
+        """
+        Store a contour in memory and, if configured, on disk.
+
+        Args: the key, the (N, 2) az, el rows, False to hold a float64 array as is rather than a copy, it is then made read only.
+
+        Returns: the read only array now held by the cache.
+        """
+        contour = np.array(contour, dtype=np.double) if copy else np.asarray(contour, dtype=np.double)
+        if contour.ndim != 2 or contour.shape[1] != 2:
+            contour = contour.reshape(-1, 2)
+        path = self._path(key)
+        if path is not None:
+            # write to a temporary file and rename so readers never see a partial file
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(handle, 'wb') as temp_file:
+                np.save(temp_file, contour)
+            os.replace(temp_path, path)
+        with self._lock:
+            return self._remember(key, contour)
+
+    def contour(self, xy: Tuple[Tuple[float, float], Tuple[float, float]], polygon: Optional[Sequence[Tuple[float, float]]] = None,
+                mode: str = "limits", resolution: float = 1.0, tolerance: float = 0.05, method: str = "vectorized",
+                previous: Optional[np.ndarray] = None, progress=None) -> np.ndarray:
+        """
+        Return the contour for a limit set, generating it with DataGen on a miss.
+
+        Args: the x, y limits, optional polygon vertices (None uses the DataGen default), "limits" for find_limits or "polygon" for find_from_point,
+              the azimuth step in degrees, the DataGen tolerance, the DataGen solver method,
+              an optional contour for nearby limits that warm starts the solver on a miss (the result agrees with a cold start within the tolerance),
+              an optional progress(done, total) callback for a miss, see DataGen.progress.
+
+        Returns: a read only (N, 2) array of az, el rows.
+        """
+        datagen = DataGen(xy, polygon)
+        datagen.tolerance = tolerance
+        datagen.progress = progress
+        key = self.key(xy, datagen.legacy_lims, mode, resolution, tolerance, method)
+        contour = self.get(key)
+        if contour is not None:
+            return contour
+        if mode == "limits":
+            datagen.find_limits(resolution, method, previous)
+        else:
+            datagen.find_from_point(resolution, method, previous)
+        # the DataGen is private to this call, so its contour array is handed over without a copy
+        return self.put(key, datagen.contour, copy=False)
+
+    def stats(self) -> dict:
+        """
+        Returns: the hit, disk hit and miss counters and the number of contours held in memory.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'entries': len(self._memory)}
+
+    def clear(self, disk: bool = False):
+        """
+        Empty the memory layer and reset the counters, optionally deleting the on disk store too.
+        """
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.npy'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key: str, contour: np.ndarray) -> np.ndarray:
+        # called with self._lock held
+        contour.setflags(write=False)
+        self._memory[key] = contour
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+        return contour
+
+    def _path(self, key: str) -> Optional[str]:
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{key}.npy")
@@ -0,0 +1,107 @@
+"""
+Generate limit contours without the GUI, for batch jobs on headless machines.
+
+    python -m src.contour_cli legacy.csv --mode polygon --resolution 0.1
+    python contour_cli.py limits.parquet --xy -80 86 -76 76 --max-error 0.05
+
+Nothing from tkinter, matplotlib or polars is imported, and numpy is only imported once the arguments have been parsed,
+so --help and argument errors return at interpreter start up speed.
+"""
+from typing import List, Optional, Sequence, Tuple
+import argparse
+import sys
+
+LEGACY_XY = (-86.0, 86.0, -76.0, 76.0)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate an x/y antenna limit contour as az, el rows.")
+    parser.add_argument('output', help="output file, .csv .parquet or .npy, or - for CSV on stdout")
+    parser.add_argument('--xy', type=float, nargs=4, default=LEGACY_XY, metavar=('X_MIN', 'X_MAX', 'Y_MIN', 'Y_MAX'),
+                        help="rectangular x and y limits in degrees, the legacy 26M limits by default")
+    parser.add_argument('--mode', choices=('limits', 'polygon'), default='limits',
+                        help="limits uses the --xy rectangle, polygon the --polygon vertices")
+    parser.add_argument('--polygon', help="CSV file of x,y polygon vertices with a header row, the 1980 26M limit lines by default")
+    parser.add_argument('--resolution', type=float, default=1.0, help="azimuth step in degrees")
+    parser.add_argument('--method', choices=('recursive', 'vectorized', 'analytic'), default='vectorized')
+    parser.add_argument('--max-error', type=float, help="refine the azimuth step adaptively to this elevation error in degrees")
+    parser.add_argument('--precision', choices=('double', 'single'), default='double',
+                        help="single solves and writes the contour in float32, for coarse screening")
+    parser.add_argument('--tolerance', type=float, default=0.05, help="how close to a limit edge a contour point must be, in degrees")
+    parser.add_argument('--format', choices=('csv', 'parquet', 'npy'), help="output format, by default from the file extension")
+    parser.add_argument('--cache-dir', help="reuse and store contours in this directory")
+    return parser
+
+
+def read_polygon(path: str) -> List[Tuple[float, float]]:
+    """
+    Read x,y vertex rows from a CSV file with a header row.
+    """
+    import csv
+    with open(path, newline='') as csv_file:
+        rows = csv.reader(csv_file)
+        next(rows, None)
+        return [(float(row[0]), float(row[1])) for row in rows if row]
+
+
+def generate(args: argparse.Namespace):
+    """
+    Returns: the (N, 2) az, el contour for the parsed arguments.
+    """
+    try:
+        from .data_generator import DataGen
+        from .contour_cache import ContourCache
+    except ImportError:
+        # run as a script or with src on sys.path
+        from data_generator import DataGen
+        from contour_cache import ContourCache
+    xy = (tuple(args.xy[:2]), tuple(args.xy[2:]))
+    polygon = read_polygon(args.polygon) if args.polygon else None
+    if args.cache_dir is not None:
+        cache = ContourCache(directory=args.cache_dir)
+        return cache.contour(xy, polygon, args.mode, args.resolution, args.tolerance, args.method)
+    datagen = DataGen(xy, polygon)
+    datagen.tolerance = args.tolerance
+    if args.precision == 'single':
+        import numpy as np
+        datagen.dtype = np.float32
+    if args.mode == 'limits':
+        datagen.find_limits(args.resolution, args.method, max_error=args.max_error)
+    else:
+        datagen.find_from_point(args.resolution, args.method, max_error=args.max_error)
+    return datagen.contour
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.mode == 'polygon' and args.method == 'analytic':
+        parser.error("the analytic method only solves the rectangular limits")
+    if args.cache_dir is not None and args.max_error is not None:
+        parser.error("--max-error contours are not cached, drop --cache-dir")
+    if args.cache_dir is not None and args.precision == 'single':
+        parser.error("the cache holds double precision contours, drop --cache-dir")
+    try:
+        from .contour_export import contour_format, write_contour, write_csv
+    except ImportError:
+        from contour_export import contour_format, write_contour, write_csv
+    if args.output != '-':
+        try:
+            fmt = contour_format(args.output, args.format)
+        except ValueError as error:
+            parser.error(str(error))
+    try:
+        contour = generate(args)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    if args.output == '-':
+        write_csv(sys.stdout, contour)
+    else:
+        write_contour(args.output, contour, fmt)
+        print(f"wrote {contour.shape[0]} rows to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
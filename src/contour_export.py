@@ -0,0 +1,92 @@
+"""
+Write limit contours to CSV, Parquet or a binary .npy file.
+
+Only numpy is imported up front, pyarrow is imported when a Parquet file is written.
+The writers read the az and el columns of the array they are given, a column major contour such as DataGen.contour
+goes to Parquet and .npy without being copied.
+"""
+from typing import Optional
+import os
+import numpy as np
+
+FORMATS = ('csv', 'parquet', 'npy')
+# rows formatted per write, large contours are written in blocks rather than line by line
+CSV_BLOCK = 8192
+EXTENSIONS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.npy': 'npy'}
+
+
+def contour_format(path: str, fmt: Optional[str] = None) -> str:
+    """
+    The output format, given explicitly or picked by the file extension.
+    """
+    if fmt is None:
+        fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"can not tell the contour format from {path!r}, use one of {', '.join(EXTENSIONS)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown contour format: {fmt}")
+    return fmt
+
+
+def write_contour(path: str, contour: np.ndarray, fmt: Optional[str] = None):
+    """
+    Write an (N, 2) az, el contour.
+
+    Args: the output path, the contour rows, "csv", "parquet" or "npy", None to use the file extension.
+    """
+    contour = _float_array(contour)
+    if contour.ndim != 2 or contour.shape[1] != 2:
+        contour = contour.reshape(-1, 2)
+    fmt = contour_format(path, fmt)
+    if fmt == 'csv':
+        write_csv(path, contour)
+    elif fmt == 'parquet':
+        write_parquet(path, contour)
+    else:
+        np.save(path, contour)
+
+
+def write_csv(target, contour: np.ndarray):
+    """
+    Write an az,el CSV with a header row, with enough digits to read back the same floats, 17 for float64 and 9 for float32.
+
+    Args: a path or an open text file, the contour rows.
+    """
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'w', newline='') as csv_file:
+            write_csv(csv_file, contour)
+        return
+    contour = _float_array(contour)
+    row = '%.9g,%.9g\n' if contour.dtype == np.float32 else '%.17g,%.17g\n'
+    target.write('az,el\n')
+    for start in range(0, len(contour), CSV_BLOCK):
+        block = contour[start:start + CSV_BLOCK]
+        target.write((row * len(block)) % tuple(np.ravel(block).tolist()))
+
+
+def contour_columns(contour: np.ndarray) -> dict:
+    """
+    The az and el columns of an (N, 2) contour, views of a column major array and copies otherwise.
+    """
+    contour = _float_array(contour)
+    return {'az': np.ascontiguousarray(contour[:, 0]), 'el': np.ascontiguousarray(contour[:, 1])}
+
+
+def write_parquet(path: str, contour: np.ndarray):
+    """
+    Write az and el columns to a Parquet file, float32 contours keep float32 columns.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet contours need the optional pyarrow package") from None
+    pq.write_table(pa.table(contour_columns(contour)), path)
+
+
+def _float_array(contour: np.ndarray) -> np.ndarray:
+    """
+    The contour as a float32 or float64 array, anything else is converted to float64.
+    """
+    contour = np.asarray(contour)
+    return contour if contour.dtype in (np.float32, np.float64) else contour.astype(np.double)
@@ -0,0 +1,112 @@
+"""
+Contour generation off the GUI thread, and the row diff that keeps table updates small.
+
+Nothing here touches Tk, the GUI polls a ContourJob from its event loop and applies the result itself.
+"""
+from typing import Optional, Sequence, Tuple
+import threading
+import numpy as np
+try:
+    from .contour_cache import ContourCache
+except ImportError:
+    # run as a script or with src on sys.path
+    from contour_cache import ContourCache
+
+
+class Cancelled(Exception):
+    """
+    Raised inside the worker to abandon a cancelled job.
+    """
+
+
+class ContourJob():
+    """
+    Run ContourCache.contour on a worker thread with progress and cancellation.
+    """
+
+    def __init__(self, cache: ContourCache, xy: Tuple[Tuple[float, float], Tuple[float, float]], mode: str = "limits",
+                 resolution: float = 1.0, previous: Optional[np.ndarray] = None, method: str = "vectorized"):
+        """
+        Args: the contour cache, the x, y limits, "limits" or "polygon", the azimuth step in degrees,
+              an optional previous contour to warm start from, the DataGen solver method.
+        """
+        self.cache = cache
+        self.arguments = dict(xy=xy, mode=mode, resolution=resolution, method=method, previous=previous)
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> 'ContourJob':
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """
+        Ask the worker to stop at the next progress report, the job then finishes with no result.
+        """
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the job finishes, for scripts and tests; the GUI polls done instead.
+
+        Returns: True if the job finished within the timeout.
+        """
+        self._thread.join(timeout)
+        return self.done
+
+    def _report(self, done: int, total: int):
+        if self._cancel.is_set():
+            raise Cancelled()
+        self.progress = done / total if total else 1.0
+
+    def _run(self):
+        try:
+            if self._cancel.is_set():
+                raise Cancelled()
+            contour = self.cache.contour(progress=self._report, **self.arguments)
+            if not self._cancel.is_set():
+                self.result = contour
+                self.progress = 1.0
+        except Cancelled:
+            pass
+        except Exception as error:
+            self.error = error
+
+
+def diff_rows(old: Optional[np.ndarray], new: np.ndarray, decimals: int = 3) -> Tuple[np.ndarray, int, int]:
+    """
+    Work out the smallest update that turns the displayed rows into the new contour, row i keeps its table item.
+
+    Args: the (N, 2) az, el rows on display or None, the new (M, 2) rows, the decimals the elevation is shown with.
+
+    Returns: the indices below min(N, M) whose shown values changed, the number of rows to append, the number of rows to delete from the end.
+    """
+    new = np.asarray(new, dtype=np.double).reshape(-1, 2)
+    if old is None:
+        return np.empty(0, dtype=np.intp), new.shape[0], 0
+    old = np.asarray(old, dtype=np.double).reshape(-1, 2)
+    common = min(old.shape[0], new.shape[0])
+    changed = np.flatnonzero((old[:common, 0] != new[:common, 0])
+                             | (np.round(old[:common, 1], decimals) != np.round(new[:common, 1], decimals)))
+    return changed, max(new.shape[0] - common, 0), max(old.shape[0] - common, 0)
+
+
+def format_rows(rows: np.ndarray, indices: Sequence[int], decimals: int = 3):
+    """
+    The table values of the given rows, az as is and el rounded.
+    """
+    rows = np.asarray(rows)
+    az = rows[indices, 0].tolist()
+    el = np.round(rows[indices, 1], decimals).tolist()
+    return list(zip(az, el))
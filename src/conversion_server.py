@@ -0,0 +1,277 @@
+"""
+A local asyncio server for az/el <-> x/y conversion and limit checks.
+
+    python conversion_server.py --port 8765            # localhost TCP
+    python conversion_server.py --unix /tmp/xy.sock    # Unix socket
+
+The protocol is one JSON object per line in each direction:
+    request   {"id": 7, "op": "azel2xy", "a": [az, ...], "b": [el, ...]}
+    response  {"id": 7, "result": [[x, ...], [y, ...]]}  or  {"id": 7, "error": "message"}
+ops are "azel2xy", "xy2azel" and "check" (a, b are az, el; the result is [inside flags, limit margins in degrees]).
+a and b may be numbers instead of lists, the result then holds numbers too.
+
+Requests for the same op that arrive within `window` seconds of each other, from any client, are converted together
+in one vectorized call. The default window of 0 batches everything read in one pass of the event loop, which under load
+coalesces as well as a timed window without adding its delay to a lone request (measured by benchmarks/bench_server.py).
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import itertools
+import json
+import numpy as np
+try:
+    from .pointing_conversion import azel_to_xy_array, xy_to_azel_array
+    from .visibility import VisibilityChecker
+except ImportError:
+    # run as a script or with src on sys.path
+    from pointing_conversion import azel_to_xy_array, xy_to_azel_array
+    from visibility import VisibilityChecker
+
+OPS = ('azel2xy', 'xy2azel', 'check')
+# the room a JSON line needs per sample, two full precision floats and separators, so a max_batch request fits in one line
+LINE_BYTES_PER_SAMPLE = 64
+
+
+class ConversionServer():
+    """
+    Coalesce concurrent conversion requests into vectorized batches.
+    """
+
+    def __init__(self, xy: Tuple[Tuple[float, float], Tuple[float, float]] = ((-86.0, 86.0), (-76.0, 76.0)),
+                 polygon: Optional[Sequence[Tuple[float, float]]] = None, window: float = 0.0, max_batch: int = 65536):
+        """
+        Args: the x/y limits and optional polygon used by "check", the batching window in seconds,
+              the number of samples that flushes a batch before the window ends.
+        """
+        self.checker = VisibilityChecker(xy, polygon, el_min=None)
+        self.window = window
+        self.max_batch = max_batch
+        # asyncio's default 64 KiB line limit would cut requests off at about 5k samples
+        self.line_limit = max(2 ** 16, LINE_BYTES_PER_SAMPLE * max_batch)
+        self._pending = {op: [] for op in OPS}
+        self._pending_size = dict.fromkeys(OPS, 0)
+        self._timers = {}
+        self._servers = []
+        self.requests = 0
+        self.batches = 0
+
+    async def convert(self, op: str, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Queue one request and wait for the batch it lands in.
+        """
+        if op not in OPS:
+            raise ValueError(f"unknown op: {op}")
+        a = np.atleast_1d(np.asarray(a, dtype=np.double))
+        b = np.atleast_1d(np.asarray(b, dtype=np.double))
+        if a.shape != b.shape or a.ndim != 1:
+            raise ValueError("a and b must be numbers or lists of the same length")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[op].append((a, b, future))
+        self._pending_size[op] += a.size
+        self.requests += 1
+        if self._pending_size[op] >= self.max_batch:
+            self._flush(op)
+        elif op not in self._timers:
+            # with no window the batch still takes every request read in the same pass of the event loop
+            if self.window > 0.0:
+                self._timers[op] = loop.call_later(self.window, self._flush, op)
+            else:
+                self._timers[op] = loop.call_soon(self._flush, op)
+        return await future
+
+    def _flush(self, op: str):
+        timer = self._timers.pop(op, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending[op]
+        if not pending:
+            return
+        self._pending[op] = []
+        self._pending_size[op] = 0
+        self.batches += 1
+        a = np.concatenate([item[0] for item in pending])
+        b = np.concatenate([item[1] for item in pending])
+        try:
+            first, second = self._compute(op, a, b)
+        except Exception as error:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        start = 0
+        for item_a, _, future in pending:
+            stop = start + item_a.size
+            if not future.done():
+                future.set_result((first[start:stop], second[start:stop]))
+            start = stop
+
+    def _compute(self, op: str, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if op == 'azel2xy':
+            return azel_to_xy_array(a, b)
+        if op == 'xy2azel':
+            return xy_to_azel_array(a, b)
+        margin = self.checker.margin(a, b)
+        return margin >= 0.0, margin
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve one client connection, its requests are answered as their batches finish, not strictly in order.
+        """
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError) as error:
+                    # an over long line leaves the stream out of step, answer and hang up
+                    writer.write(json.dumps({'id': None, 'error': f"request line too long: {error}"}).encode() + b'\n')
+                    break
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            scalar = np.ndim(request['a']) == 0
+            first, second = await self.convert(request['op'], request['a'], request['b'])
+            result = [first.tolist(), second.tolist()]
+            if scalar:
+                result = [result[0][0], result[1][0]]
+            response = {'id': request_id, 'result': result}
+        except Exception as error:
+            response = {'id': request_id, 'error': str(error)}
+        writer.write(json.dumps(response).encode() + b'\n')
+        await writer.drain()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765) -> asyncio.AbstractServer:
+        """
+        Listen on localhost TCP, port 0 picks a free port.
+        """
+        server = await asyncio.start_server(self._handle, host, port, limit=self.line_limit)
+        self._servers.append(server)
+        return server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """
+        Listen on a Unix socket.
+        """
+        server = await asyncio.start_unix_server(self._handle, path, limit=self.line_limit)
+        self._servers.append(server)
+        return server
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+
+class ConversionClient():
+    """
+    A pipelining client, many requests can be in flight on one connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765, path: Optional[str] = None,
+                      max_batch: int = 65536) -> 'ConversionClient':
+        """
+        Args: the TCP address or a Unix socket path, the largest number of samples in one response.
+        """
+        limit = max(2 ** 16, LINE_BYTES_PER_SAMPLE * max_batch)
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=limit)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        return cls(reader, writer)
+
+    async def request(self, op: str, a, b) -> List:
+        """
+        Send one request and wait for its result.
+
+        Returns: the [first, second] result lists, or numbers for number inputs. Server errors raise RuntimeError.
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(json.dumps({'id': request_id, 'op': op, 'a': a, 'b': b}).encode() + b'\n')
+        await self._writer.drain()
+        return await future
+
+    async def _listen(self):
+        reason = "the server closed the connection"
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                request_id = response.get('id')
+                if request_id is None and 'error' in response:
+                    # a connection level error, the server hangs up after it
+                    raise ConnectionError(response['error'])
+                future = self._waiting.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if 'error' in response:
+                    future.set_exception(RuntimeError(response['error']))
+                else:
+                    future.set_result(response['result'])
+        except (ConnectionError, ValueError) as error:
+            reason = str(error) or type(error).__name__
+        finally:
+            # every request still waiting fails rather than hanging
+            waiting, self._waiting = self._waiting, {}
+            for future in waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(reason))
+
+    async def close(self):
+        self._writer.close()
+        await self._listener
+
+
+async def serve(host: str, port: int, path: Optional[str], window: float):
+    server = ConversionServer(window=window)
+    if path is not None:
+        listener = await server.start_unix(path)
+    else:
+        listener = await server.start(host, port)
+    print(f"serving on {path or (host, port)}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve az/el <-> x/y conversions to local clients.")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP address, localhost by default")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', dest='path', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--window', type=float, default=0.0, help="batching window in seconds, 0 batches what each event loop pass has read")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.path, args.window))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,72 +1,482 @@
-from typing import Tuple
-from pointing_conversion import ENU
+from typing import NamedTuple, Sequence, Tuple
+try:
+    from .pointing_conversion import ENU, azel_to_xy_array
+    from .limit_polygon import LimitPolygon
+    from .reachability_mask import ReachabilityMask
+except ImportError:
+    # run as a script or with src on sys.path
+    from pointing_conversion import ENU, azel_to_xy_array
+    from limit_polygon import LimitPolygon
+    from reachability_mask import ReachabilityMask
 import math
+import numpy as np
 # 26M limit lines cirica 1980, with corners estimated at:
 # (86, 61), (77, 61), (77, 71), (57, 71), (57, 74), (-57, 74), (-57, 71), (-77, 71), (-77, 61), (-86, 61), (-86, -64), (-71, -64), (-71, -71), (71, -71), (71, -64), (86, -64)
 
+class SearchResult(NamedTuple):
+    """ The outcome of one elevation search along one azimuth.
+    """
+    elevation: float    # degrees; when the search did not converge the lowest elevation probed inside, NaN if no probe was inside
+    iterations: int     # search steps, one ENU evaluation each
+    bracket: float      # width in degrees of the (outside, inside) bracket around the final step
+    converged: bool     # False when max_iter ran out before a point inside and near an edge was found
+
+
 class DataGen():
     """
     Given the minimum and maximum values for both x and y axis, generate a dataset of the resulting azimuth and elevation values for every degree of azimuth.
     """
+    # azimuths searched between progress callbacks
+    PROGRESS_BLOCK = 2048
     
-    def __init__(self, xy: Tuple[Tuple[float, float], Tuple[float, float]] = ((-86.0, 86.0), (-76.0, 76.0))):
+    def __init__(self, xy: Tuple[Tuple[float, float], Tuple[float, float]] = ((-86.0, 86.0), (-76.0, 76.0)), polygon: Sequence[Tuple[float, float]] = None):
         """
         Processes limit data
 
         Args: a tuple of two tuples of two floats representing the x and y minimum and maximum values. Defaults to ((-86,86), (-76,76)) the legacy 26M antenna limits.
+              an optional sequence of (x, y) polygon vertices used by find_from_point. Defaults to the 1980 26M limit lines.
         """
         self.tolerance = 0.05
+        # the smallest azimuth step the adaptive sampler refines to
+        self.min_step = 0.01
+        # the search step limit and the secant (Illinois) acceleration of the one azimuth at a time solver
+        self.max_iter = 64
+        self.accelerate = False
+        # per azimuth iterations, evaluations, bracket and converged arrays of the last find_limits or find_from_point
+        self.search_stats = None
+        # an optional progress(done, total) callback of the elevation searches, it may raise to abandon the search
+        self.progress = None
+        # the float precision of the "vectorized" and "analytic" solvers and of self.contour, np.float32 halves the memory
+        # traffic for coarse screening, the conversions then add up to FLOAT32_ERROR degrees (see pointing_conversion)
+        self.dtype = np.double
+        # the (N, 2) az, el rows of the last find_limits or find_from_point, column major so each column is contiguous
+        self.contour = np.empty((0, 2), order='F')
         self.x, self.y = xy
         self.enu = ENU(xy=(0.0, 0.0))
 
-        self.legacy_lims = [(86, 61), (77, 61), (77, 71), (57, 71), (57, 74), (-57, 74), (-57, 71), (-77, 71), (-77, 61), (-86, 61), (-86, -64), (-71, -64), (-71, -71), (71, -71), (71, -64), (86, -64)]
+        if polygon is None:
+            polygon = [(86, 61), (77, 61), (77, 71), (57, 71), (57, 74), (-57, 74), (-57, 71), (-77, 71), (-77, 61), (-86, 61), (-86, -64), (-71, -64), (-71, -71), (71, -71), (71, -64), (86, -64)]
+        self.legacy_lims = polygon
+
+    @property
+    def legacy_lims(self) -> list:
+        return self._legacy_lims
 
-    def find_limits(self):
+    @legacy_lims.setter
+    def legacy_lims(self, vertices: Sequence[Tuple[float, float]]):
+        # the edge data is built once here rather than on every point test
+        self._legacy_lims = list(vertices)
+        self.polygon = LimitPolygon(self._legacy_lims)
+
+    def find_limits(self, resolution: float = 1.0, method: str = "recursive", previous: Sequence[Tuple[float, float]] = None,
+                    max_error: float = None):
         """
         Using ENU.from_azel check determine the azimuth and elvation of the xy limits. 
+
+        Args: the azimuth step in degrees, the solver method; "recursive" bisects one azimuth at a time, "vectorized" bisects every azimuth at once, "analytic" solves the limit edges exactly.
+              an optional previous contour of (az, el) rows to warm start the "recursive" and "vectorized" solvers from, see warm_start.
+              an optional maximum elevation error in degrees, the azimuths are then refined from the resolution step where needed, see adaptive_azimuths.
+        """
+        azimuths = self.azimuth_range(resolution)
+        el_min = 0.0 + 1e-9
+        el_max = 89.99
+        if method == "analytic":
+            solve = self.analytic_find_el
+        elif method in ("recursive", "vectorized"):
+            def solve(azimuths):
+                return self._solve(azimuths, el_min, el_max, method, self._limit_probe, self.test_limits_azel, previous)
+        else:
+            raise ValueError(f"unknown limit method: {method}")
+        self._sample(azimuths, solve, self.limit_edge, max_error)
+
+    @property
+    def limit_list(self) -> list:
         """
-        self.limit_list = []
-        for azimuth in range(0, 360):
-            el_min = 0.0 + 1e-9
-            el_max = 89.99
-            elevation = self.recursive_find_el(azimuth, el_min, el_max)
-            self.limit_list.append((azimuth, elevation))
-            #print(f"azimuth: {azimuth}, elevation: {round(elevation, 3)}")
+        The contour as a list of (az, el) tuples, built on every access; prefer self.contour.
+        """
+        return list(zip(self.contour[:, 0].tolist(), self.contour[:, 1].tolist()))
 
-    def find_from_point(self):
+    @staticmethod
+    def azimuth_range(resolution: float = 1.0) -> np.ndarray:
         """
-        Using ENU.from_azel check determine the azimuth and elvation of the xy limits. 
+        Build the azimuths sampled for a limit set.
+
+        Args: the azimuth step in degrees.
+
+        Returns: an array of azimuths from 0 up to but not including 360 degrees.
         """
-        self.limit_list = []
-        for azimuth in range(0, 360):
-            el_min = 0.0 + 1e-9
-            el_max = 89.99
-            elevation = self.recursive_point_resolve(azimuth, el_min, el_max)
-            self.limit_list.append((azimuth, elevation))
-            #print(f"azimuth: {azimuth}, elevation: {round(elevation, 3)}")
+        if resolution <= 0:
+            raise ValueError(f"azimuth resolution must be positive, got {resolution}")
+        count = int(round(360.0 / resolution))
+        return np.arange(count) * (360.0 / count)
+
+    def find_from_point(self, resolution: float = 1.0, method: str = "recursive", previous: Sequence[Tuple[float, float]] = None,
+                        max_error: float = None):
+        """
+        Using ENU.from_azel check determine the azimuth and elvation of the polygon limits. 
+
+        Args: the azimuth step in degrees, the solver method; "recursive" bisects one azimuth at a time, "vectorized" bisects every azimuth at once.
+              an optional previous contour of (az, el) rows to warm start the solver from, see warm_start.
+              an optional maximum elevation error in degrees, the azimuths are then refined from the resolution step where needed, see adaptive_azimuths.
+        """
+        azimuths = self.azimuth_range(resolution)
+        el_min = 0.0 + 1e-9
+        el_max = 89.99
+        if method not in ("recursive", "vectorized"):
+            raise ValueError(f"unknown limit method: {method}")
+
+        def solve(azimuths):
+            return self._solve(azimuths, el_min, el_max, method, self._polygon_probe, self.test_polygon_azel, previous)
+        self._sample(azimuths, solve, self.polygon_edge, max_error)
+
+    def _sample(self, azimuths: np.ndarray, solve, edge, max_error: float):
+        """
+        Fill self.contour from the given azimuths, or from adaptively refined azimuths when max_error is set.
+        The searches of every solve call are gathered into self.search_stats.
+        """
+        self._stats = []
+        if max_error is None:
+            elevations = solve(azimuths)
+        else:
+            azimuths, elevations = self.adaptive_azimuths(azimuths, solve, edge, max_error)
+        contour = np.empty((azimuths.size, 2), dtype=self.dtype, order='F')
+        contour[:, 0] = azimuths
+        contour[:, 1] = elevations
+        self.contour = contour
+        names = ('azimuth', 'iterations', 'evaluations', 'bracket', 'converged')
+        self.search_stats = {name: np.concatenate([stats[name] for stats in self._stats]) if self._stats else np.empty(0)
+                             for name in names}
+
+    def _solve(self, azimuths: np.ndarray, el_min: float, el_max: float, method: str, probe, classify, previous) -> np.ndarray:
+        """
+        Search the elevations of the azimuths, optionally warm started, one azimuth at a time or all at once.
+
+        Args: the azimuths, the elevation search limits, "recursive" or "vectorized", the probe(az, el) of the one at a time search,
+              the classify(az, el) of the array search, the previous contour or None.
+        """
+        lower = np.full(azimuths.shape, el_min, dtype=self.dtype)
+        upper = np.full(azimuths.shape, el_max, dtype=self.dtype)
+        elevations = np.full(azimuths.shape, np.nan, dtype=self.dtype)
+        evaluations = np.zeros(azimuths.shape, dtype=np.intp)
+        if previous is not None:
+            elevations, lower, upper = self.warm_start(azimuths, previous, el_min, el_max, classify)
+            evaluations += self.warm_stats['evaluations']
+        todo = np.flatnonzero(np.isnan(elevations))
+        iterations = np.zeros(azimuths.shape, dtype=np.intp)
+        bracket = np.zeros(azimuths.shape)
+        converged = np.ones(azimuths.shape, dtype=bool)
+        step = todo.size if self.progress is None else self.PROGRESS_BLOCK
+        for start in range(0, todo.size, max(step, 1)):
+            block = todo[start:start + step]
+            if method == "recursive":
+                for index in block.tolist():
+                    result = self._search(float(azimuths[index]), float(lower[index]), float(upper[index]), probe)
+                    elevations[index], iterations[index], bracket[index], converged[index] = result
+            else:
+                elevations[block], stats = self._vector_bisect(azimuths[block], lower[block], upper[block], classify, self.max_iter)
+                iterations[block], bracket[block], converged[block] = stats
+            if self.progress is not None:
+                self.progress(start + block.size, todo.size)
+        evaluations += iterations
+        self._stats.append({'azimuth': azimuths, 'iterations': iterations, 'evaluations': evaluations,
+                            'bracket': bracket, 'converged': converged})
+        return elevations
 
-    def recursive_find_el(self, azimuth: float, el_min: float, el_max: float) -> float:
+    def _search(self, azimuth: float, el_min: float, el_max: float, probe) -> SearchResult:
         """
-        A recursive function to find the minimum elevation that is above the x,y limits.
+        Search one azimuth for the minimum elevation inside and near a limit edge, with a loop rather than recursion.
 
-        Args: the azimuth angle in degrees, the minimum elevation search limit, the maximum elevation search limit.
+        Every step halves the (outside, inside) bracket. With self.accelerate a step instead follows the secant through the
+        signed limit margins at both ends once both are known, and the Illinois rule halves the margin of an end that stays put
+        twice in a row so the bracket keeps closing from both sides.
 
-        Returns: the minimum elevation in degrees that respcts the limit.
+        Args: the azimuth angle in degrees, the minimum and maximum elevation search limits, a probe(az, el) function returning
+              inside, near an edge and the signed margin in degrees.
 
+        Returns: a SearchResult. When self.max_iter steps run out converged is False and the elevation is the lowest one
+                 probed inside, or NaN when no probe was inside, as for limits that do not contain the zenith.
         """
-        if el_max >= el_min:
-            mid = (el_max + el_min) / 2.0
-            self.enu.from_azel(azimuth, mid)
-            if all(self.test_limits(self.enu.xy)):
-                # this point is inside all limits and within the absolute tolorance of 0.05 degrees
-                return mid
-            elif any(self.test_limits(self.enu.xy)):
-                # inside the limits but not close to our edge, reduce the value; make the mid the max before the next divide.
-                return self.recursive_find_el(azimuth, el_min, mid)
+        if el_max < el_min:
+            raise ValueError(f"empty elevation bracket ({el_min}, {el_max}) at azimuth {azimuth}")
+        lower, upper = el_min, el_max
+        # el_max itself is never probed, it only counts once a probe was inside
+        seen_inside = False
+        # the secant aims for the middle of the near edge band
+        target = self.tolerance / 2.0
+        f_lower = f_upper = None
+        last_moved = None
+        for iteration in range(1, self.max_iter + 1):
+            el = (lower + upper) / 2.0
+            if self.accelerate and f_lower is not None and f_upper is not None:
+                secant = upper - f_upper * (upper - lower) / (f_upper - f_lower)
+                if lower < secant < upper:
+                    el = secant
+            inside, close, margin = probe(azimuth, el)
+            if inside and close:
+                return SearchResult(el, iteration, upper - lower, True)
+            if inside:
+                seen_inside = True
+                # inside but not near the edge, the contour is lower
+                upper, f_upper = el, margin - target if margin is not None else None
+                if last_moved == 'upper' and f_lower is not None:
+                    f_lower /= 2.0
+                last_moved = 'upper'
             else:
-                # this point is outside the limits, make the mid the min before the next divide.
-                #print(f"{azimuth}, {el_min}, {mid}")
-                return self.recursive_find_el(azimuth, mid, el_max)
+                lower, f_lower = el, margin - target if margin is not None else None
+                if last_moved == 'lower' and f_upper is not None:
+                    f_upper /= 2.0
+                last_moved = 'lower'
+        return SearchResult(upper if seen_inside else math.nan, self.max_iter, upper - lower, False)
+
+    def _limit_probe(self, azimuth: float, el: float) -> Tuple[bool, bool, float]:
+        """
+        Check one az, el point against the x,y limits.
+
+        Returns: inside, inside and near an edge, the distance to the closest limit line, negative outside.
+        """
+        self.enu.from_azel(azimuth, el)
+        x, y = self.enu.xy
+        inside, close = self.test_limits((x, y))
+        return inside, close, min(x - self.x[0], self.x[1] - x, y - self.y[0], self.y[1] - y)
+
+    def _polygon_probe(self, azimuth: float, el: float) -> Tuple[bool, bool, float]:
+        """
+        Check one az, el point against the polygon limits.
+
+        Returns: inside, inside and near an edge, the distance to the closest edge, negative outside (only with self.accelerate, else None).
+        """
+        self.enu.from_azel(azimuth, el)
+        inside, distance = self.point_in_polygon(self.enu.xy)
+        if inside and distance < self.tolerance:
+            return True, True, distance
+        if inside and distance > self.tolerance:
+            return True, False, distance
+        # outside, point_in_polygon has no distance so the segment distance is used
+        if not self.accelerate:
+            return False, False, None
+        x, y = self.enu.xy
+        return False, False, -float(self.polygon.contains(x, y)[1])
+
+    def adaptive_azimuths(self, azimuths: np.ndarray, solve, edge, max_error: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Refine a coarse azimuth sampling until linear interpolation between samples meets an elevation error.
+
+        Every interval between neighbouring samples is tested at its midpoint, it is split in two when the solved elevation there
+        is more than max_error from the straight line between the ends, or when the ends and the midpoint do not all bind on the
+        same limit edge, so corners are located down to self.min_step. Smooth stretches keep the coarse step.
+        The midpoint test is a probe rather than a bound, and the bisection solvers only place each point within self.tolerance
+        of an edge, so a max_error much below the elevation that tolerance spans will refine down to self.min_step everywhere.
+
+        Args: the sorted starting azimuths in degrees, a solve(azimuths) function returning elevations,
+              an edge(az, el) function returning the index of the binding limit edge, the maximum elevation error in degrees.
+
+        Returns: the sorted azimuth and elevation arrays.
+        """
+        if max_error <= 0:
+            raise ValueError(f"max_error must be positive, got {max_error}")
+        azimuths = np.asarray(azimuths, dtype=np.double)
+        elevations = solve(azimuths)
+        edges = edge(azimuths, elevations)
+        kept_az, kept_el = [azimuths], [elevations]
+        # every interval as left and right end arrays, the last one wraps through 360
+        left = (azimuths, elevations, edges)
+        right = tuple(np.roll(a, -1) for a in left)
+        right[0][-1] += 360.0
+        width = right[0] - left[0]
+        while width.size:
+            mid_az = (left[0] + right[0]) / 2.0
+            mid_el = solve(mid_az % 360.0)
+            mid_edge = edge(mid_az % 360.0, mid_el)
+            error = np.abs(mid_el - (left[1] + right[1]) / 2.0)
+            split = ((error > max_error) | (left[2] != mid_edge) | (right[2] != mid_edge)) & (width / 2.0 > self.min_step)
+            mid = (mid_az[split], mid_el[split], mid_edge[split])
+            kept_az.append(mid[0] % 360.0)
+            kept_el.append(mid[1])
+            # both halves of a split interval are tested again
+            left, right = (tuple(np.concatenate((l[split], m)) for l, m in zip(left, mid)),
+                           tuple(np.concatenate((m, r[split])) for m, r in zip(mid, right)))
+            width = right[0] - left[0]
+        azimuths = np.concatenate(kept_az)
+        order = np.argsort(azimuths, kind='stable')
+        return azimuths[order], np.concatenate(kept_el)[order]
+
+    def limit_edge(self, az: np.ndarray, el: np.ndarray) -> np.ndarray:
+        """
+        The closest x,y limit edge of arrays of azimuth and elevation; 0 x min, 1 x max, 2 y min, 3 y max.
+        """
+        x, y = azel_to_xy_array(az, el)
+        return np.abs(np.stack((x - self.x[0], self.x[1] - x, y - self.y[0], self.y[1] - y))).argmin(axis=0)
+
+    def polygon_edge(self, az: np.ndarray, el: np.ndarray) -> np.ndarray:
+        """
+        The closest polygon edge of arrays of azimuth and elevation, see LimitPolygon.nearest_edge.
+        """
+        return self.polygon.nearest_edge(*azel_to_xy_array(az, el))
+
+    def warm_start(self, azimuths: np.ndarray, previous: Sequence[Tuple[float, float]], el_min: float, el_max: float,
+                   classify, step: float = 0.5, max_expand: int = 8) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reuse a previous contour after the limits changed.
+
+        An old elevation that is still inside and near an edge of the new limits is kept, its binding edge did not move.
+        Every other azimuth gets a bracket grown outwards from its old elevation in steps of step, 2 step, 4 step ...,
+        so a small change in the limits needs a few bisection steps instead of a search over the whole sky.
+        The counts of kept and recomputed azimuths and the per azimuth evaluations are left in self.warm_stats.
+
+        Args: an array of azimuth angles in degrees, the previous contour as (az, el) rows (any azimuth spacing),
+              the elevation search limits, a classify(az, el) function, the first bracket step in degrees, the number of times the step doubles.
+
+        Returns: the kept elevations with NaN where a search is still needed, and the lower and upper bracket arrays.
+        """
+        previous = np.asarray(previous, dtype=np.double).reshape(-1, 2)
+        # azimuths the old limits never reached (NaN) give no guess
+        previous = previous[~np.isnan(previous[:, 1])]
+        lower = np.full(azimuths.shape, el_min, dtype=self.dtype)
+        upper = np.full(azimuths.shape, el_max, dtype=self.dtype)
+        elevations = np.full(azimuths.shape, np.nan, dtype=self.dtype)
+        if previous.shape[0] == 0:
+            self.warm_stats = {'kept': 0, 'recomputed': int(azimuths.size), 'evaluations': np.zeros(azimuths.shape, dtype=np.intp)}
+            return elevations, lower, upper
+        guess = np.interp(azimuths, previous[:, 0], previous[:, 1], period=360.0)
+        guess = np.clip(guess, el_min, el_max)
+        evaluations = np.ones(azimuths.shape, dtype=np.intp)
+        inside, close = classify(azimuths, guess)
+        found = inside & close
+        elevations[found] = guess[found]
+        # inside but away from the edge the contour is lower, outside it is higher
+        upper[inside] = guess[inside]
+        lower[~inside] = guess[~inside]
+        down = np.flatnonzero(inside & ~close)
+        up = np.flatnonzero(~inside)
+        width = step
+        for _ in range(max_expand):
+            if down.size == 0 and up.size == 0:
+                break
+            if down.size:
+                probe = np.maximum(upper[down] - width, el_min)
+                evaluations[down] += 1
+                inside, close = classify(azimuths[down], probe)
+                hit = inside & close
+                elevations[down[hit]] = probe[hit]
+                lower[down[~inside]] = probe[~inside]
+                upper[down[inside]] = probe[inside]
+                down = down[inside & ~close & (probe > el_min)]
+            if up.size:
+                probe = np.minimum(lower[up] + width, el_max)
+                evaluations[up] += 1
+                inside, close = classify(azimuths[up], probe)
+                hit = inside & close
+                elevations[up[hit]] = probe[hit]
+                upper[up[inside]] = probe[inside]
+                lower[up[~inside]] = probe[~inside]
+                up = up[~inside & (probe < el_max)]
+            width *= 2.0
+        self.warm_stats = {'kept': int(np.count_nonzero(found)), 'recomputed': int(azimuths.size - np.count_nonzero(found)),
+                           'evaluations': evaluations}
+        return elevations, lower, upper
+
+    def recursive_find_el(self, azimuth: float, el_min: float, el_max: float, strict: bool = False) -> float:
+        """
+        Find the minimum elevation that is above the x,y limits. The search is a loop now, see _search, the name is kept for existing callers.
+
+        Args: the azimuth angle in degrees, the minimum elevation search limit, the maximum elevation search limit,
+              True to raise ValueError when the search does not converge.
+
+        Returns: the minimum elevation in degrees that respcts the limit, NaN when no probe was inside the limits,
+                 raises ValueError when el_max is below el_min.
+
+        """
+        return _checked(self._search(azimuth, el_min, el_max, self._limit_probe), azimuth, strict)
+
+    def vector_find_el(self, azimuths: np.ndarray, el_min: float, el_max: float, max_iter: int = 64) -> np.ndarray:
+        """
+        The array form of recursive_find_el, every azimuth is bisected at once with the same steps.
+
+        Args: an array of azimuth angles in degrees, the minimum elevation search limit, the maximum elevation search limit, the maximum number of bisection steps.
+
+        Returns: an array of the minimum elevations in degrees that respect the limits.
+
+        """
+        return self._vector_bisect(azimuths, el_min, el_max, self.test_limits_azel, max_iter)[0]
+
+    def vector_point_resolve(self, azimuths: np.ndarray, el_min: float, el_max: float, max_iter: int = 64) -> np.ndarray:
+        """
+        The array form of recursive_point_resolve, using the distance to the closest polygon edge segment.
+
+        Args: an array of azimuth angles in degrees, the minimum elevation search limit, the maximum elevation search limit, the maximum number of bisection steps.
+
+        Returns: an array of the minimum elevations in degrees that respect the polygon limits.
+
+        """
+        return self._vector_bisect(azimuths, el_min, el_max, self.test_polygon_azel, max_iter)[0]
+
+    def _vector_bisect(self, azimuths: np.ndarray, el_min, el_max, classify, max_iter: int) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Bisect the elevation of every azimuth at once.
+
+        Args: an array of azimuth angles in degrees, the elevation search limits as numbers or per azimuth arrays, a classify(az, el) function returning the inside and near edge boolean arrays, the maximum number of bisection steps.
+
+        Returns: an array of the minimum elevations in degrees that are inside and near the edge,
+                 and the per azimuth iterations, final bracket widths and converged flags. An azimuth that did not converge
+                 gets the lowest elevation probed inside, or NaN when no probe was inside.
+
+        """
+        azimuths = np.asarray(azimuths, dtype=self.dtype)
+        lower = np.full(azimuths.shape, el_min, dtype=self.dtype)
+        upper = np.full(azimuths.shape, el_max, dtype=self.dtype)
+        elevations = np.array(upper)
+        iterations = np.zeros(azimuths.shape, dtype=np.intp)
+        bracket = np.zeros(azimuths.shape)
+        seen_inside = np.zeros(azimuths.shape, dtype=bool)
+        active = np.arange(azimuths.size)
+        for _ in range(max_iter):
+            if active.size == 0:
+                break
+            iterations[active] += 1
+            mid = (upper[active] + lower[active]) / 2.0
+            inside, close = classify(azimuths[active], mid)
+            found = inside & close
+            seen_inside[active[inside]] = True
+            elevations[active[found]] = mid[found]
+            bracket[active[found]] = upper[active[found]] - lower[active[found]]
+            # inside but not near the edge reduces the max, outside raises the min
+            lower_it = inside & ~close
+            upper[active[lower_it]] = mid[lower_it]
+            lower[active[~inside]] = mid[~inside]
+            active = active[~found]
+        # anything left did not converge, the lowest elevation probed inside is the best answer, the untested top is not one
+        elevations[active] = np.where(seen_inside[active], upper[active], np.nan)
+        bracket[active] = upper[active] - lower[active]
+        converged = np.ones(azimuths.shape, dtype=bool)
+        converged[active] = False
+        return elevations, (iterations, bracket, converged)
+
+    def analytic_find_el(self, azimuths: np.ndarray) -> np.ndarray:
+        """
+        Solve for the minimum elevation above the x,y limits without iterating.
+
+        Along an azimuth both |x| and |y| shrink as the elevation rises, so each limit edge gives one elevation bound:
+            tan(x) = sin(az) / tan(el)  ->  el_x = atan(|sin(az)| / tan(x_lim))
+            sin(y) = cos(az) * cos(el)  ->  el_y = acos(sin(y_lim) / |cos(az)|)
+        where x_lim and y_lim are the edges on the side the azimuth points to. The answer is the larger of the two.
+
+        Args: an array of azimuth angles in degrees.
+
+        Returns: an array of the minimum elevations in degrees that respect the limits.
+
+        """
+        if not (self.x[0] < 0.0 < self.x[1] and self.y[0] < 0.0 < self.y[1]):
+            raise ValueError(f"the analytic solver needs limits around the zenith, got x={self.x}, y={self.y}")
+        azimuths = np.radians(np.asarray(azimuths, dtype=self.dtype))
+        sin_az = np.sin(azimuths)
+        cos_az = np.cos(azimuths)
+        x_lim = np.radians(np.where(sin_az >= 0.0, self.x[1], -self.x[0]))
+        y_lim = np.radians(np.where(cos_az >= 0.0, self.y[1], -self.y[0]))
+        # limits at or past 90 degrees never bind
+        el_x = np.where(x_lim < np.pi / 2, np.arctan2(np.abs(sin_az) * np.cos(x_lim), np.sin(x_lim)), 0.0)
+        ratio = np.divide(np.sin(y_lim), np.abs(cos_az), out=np.ones_like(cos_az), where=np.abs(cos_az) > np.sin(y_lim))
+        el_y = np.where(y_lim < np.pi / 2, np.arccos(np.clip(ratio, -1.0, 1.0)), 0.0)
+        return np.degrees(np.maximum(el_x, el_y))
 
     def test_limits(self, xy: Tuple[float, float]) -> Tuple[bool, bool]:
         """
@@ -85,8 +495,8 @@ class DataGen():
             # outside the y limits
             return (False, False)
         # inside the limits by how much? I think this is fragile in the corners. X and Y could both be close
-        x_lim = math.isclose(x, self.x[0], abs_tol=0.05) or math.isclose(x, self.x[1], abs_tol=0.05)
-        y_lim = math.isclose(y, self.y[0], abs_tol=0.05) or math.isclose(y, self.y[1], abs_tol=0.05)
+        x_lim = math.isclose(x, self.x[0], abs_tol=self.tolerance) or math.isclose(x, self.x[1], abs_tol=self.tolerance)
+        y_lim = math.isclose(y, self.y[0], abs_tol=self.tolerance) or math.isclose(y, self.y[1], abs_tol=self.tolerance)
         if x_lim or y_lim:
             # I think we found our limit
             #print(f"x:{xy[0]:.3f}-{x_lim}, y:{xy[1]:.3f}-{y_lim}-{self.y[1]}")
@@ -94,29 +504,49 @@ class DataGen():
         # inside the limits but not close
         return (True, False)
 
-    def recursive_point_resolve(self, azimuth, el_min, el_max) -> float:
+    def test_limits_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The array form of test_limits.
+
+        Args: arrays of the x and y positions.
+
+        Returns: two boolean arrays, inside both limits and inside within the tolerance of a limit edge.
+
+        """
+        x_round = np.round(x, 4)
+        y_round = np.round(y, 4)
+        inside = (self.x[0] <= x_round) & (x_round <= self.x[1]) & (self.y[0] <= y_round) & (y_round <= self.y[1])
+        x_lim = (np.abs(x - self.x[0]) <= self.tolerance) | (np.abs(x - self.x[1]) <= self.tolerance)
+        y_lim = (np.abs(y - self.y[0]) <= self.tolerance) | (np.abs(y - self.y[1]) <= self.tolerance)
+        return inside, inside & (x_lim | y_lim)
+
+    def test_limits_azel(self, az: np.ndarray, el: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        test_limits_array for arrays of azimuth and elevation.
+        """
+        return self.test_limits_array(*azel_to_xy_array(az, el, self.dtype))
+
+    def test_polygon_azel(self, az: np.ndarray, el: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Check arrays of azimuth and elevation against the polygon limits.
+
+        Returns: two boolean arrays, inside the polygon and inside within the tolerance of an edge.
         """
-        Recursivlely reduce the elevation until we are very near the edge. Then return the elevation value.
+        inside, distance = self.points_in_polygon(*azel_to_xy_array(az, el, self.dtype))
+        return inside, inside & (distance < self.tolerance)
+
+    def recursive_point_resolve(self, azimuth, el_min, el_max, strict: bool = False) -> float:
+        """
+        Reduce the elevation until we are very near a polygon edge, then return the elevation value. The search is a loop now, see _search.
  
-        Args: the azimuth angle in degrees, the minimum elevation search limit, the maximum elevation search limit.
+        Args: the azimuth angle in degrees, the minimum elevation search limit, the maximum elevation search limit,
+              True to raise ValueError when the search does not converge.
 
-        Returns: the minimum elevation in degrees that respcts the limit.
+        Returns: the minimum elevation in degrees that respcts the limit, NaN when no probe was inside the polygon,
+                 raises ValueError when el_max is below el_min.
 
         """
-        if el_max >= el_min:
-            mid = (el_max + el_min) / 2.0
-            self.enu.from_azel(azimuth, mid)
-            inside, distance = self.point_in_polygon(self.enu.xy)
-            if inside and distance < self.tolerance:
-                # this point is inside all limits and within the absolute tolorance of 0.05 degrees
-                return mid
-            elif inside and distance > self.tolerance:
-                # inside the limits but not close to our edge, reduce the value; make the mid the max before the next divide.
-                return self.recursive_point_resolve(azimuth, el_min, mid)
-            else:
-                # this point is outside the limits, make the mid the min before the next divide.
-                #print(f"{azimuth}, {el_min}, {mid}")
-                return self.recursive_point_resolve(azimuth, mid, el_max)
+        return _checked(self._search(azimuth, el_min, el_max, self._polygon_probe), azimuth, strict)
 
     def point_in_polygon(self, point: Tuple[float, float])  -> Tuple[bool, float]:
         """
@@ -129,37 +559,40 @@ class DataGen():
         Returns:
             Tuple[bool, float]: A tuple containing a boolean indicating if the  point is inside the polygon and the distance to the closest edge.
         """
-        x, y = point
+        return self.polygon.point_in_polygon(point)
 
-        # Initialize variables for Ray Casting algorithm
-        inside = False
+    def points_in_polygon(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Check a batch of points against the polygon limits.
 
-        # Iterate through each polygon edge
-        x, y = point
-        inside = False
-        min_distance = float('inf')
+        Args: arrays of the x and y positions.
 
-        for i in range(len(self.legacy_lims)):
-            x1, y1 = self.legacy_lims[i]
-            x2, y2 = self.legacy_lims[(i + 1) % len(self.legacy_lims)]
+        Returns: a boolean array of the points inside the polygon and an array of the distances to the closest edge segment.
+        """
+        return self.polygon.contains(x, y)
 
-            # Ray casting algorithm to determine if the point is inside
-            if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
-                inside = not inside
+    def reachability_mask(self, mode: str = "limits", step: float = 0.1) -> ReachabilityMask:
+        """
+        Compile the limits into an az/el grid for screening many points, see ReachabilityMask.
 
-            # Calculate distance to the current edge
-            distance = abs((x2 - x1) * (y1 - y) - (x1 - x) * (y2 - y1)) / math.sqrt ((x2 - x1)**2 + (y2 - y1)**2)
+        Args: "limits" for the x,y rectangle or "polygon" for self.legacy_lims, the grid step in degrees.
+        """
+        if mode == "limits":
+            return ReachabilityMask((self.x, self.y), step=step)
+        if mode == "polygon":
+            return ReachabilityMask(polygon=self.legacy_lims, step=step)
+        raise ValueError(f"unknown limit mode: {mode}")
 
-            # Check if the point is on the edge
-            if distance < 1e-9 and min(x1, x2) <= x <= max(x1, x2) and min(y1, y2)  <= y <= max(y1, y2):
-                return True, 0  # Point is on the edge
 
-            min_distance = min(min_distance, distance)
 
-        if inside:
-            return True, min_distance
-        else:
-            return False, None
+def _checked(result: SearchResult, azimuth: float, strict: bool) -> float:
+    """
+    The elevation of a search, raising ValueError for a search that did not converge when strict.
+    """
+    if strict and not result.converged:
+        raise ValueError(f"the elevation search at azimuth {azimuth} did not converge in {result.iterations} steps, "
+                         f"bracket {result.bracket} degrees")
+    return result.elevation
 
 
 if __name__ == '__main__':
@@ -0,0 +1,140 @@
+"""
+Opt-in call counting and timing for the ENU and DataGen hot paths.
+
+Nothing is wrapped until enable() is called and disable() puts the original functions back on the classes, so the hot
+paths run exactly the same code as before when instrumentation is off.
+
+    with Instrumentation() as probe:
+        DataGen().find_limits()
+    print(probe.report())
+
+Times are inclusive wall times, a method that calls another instrumented method counts the inner call in both.
+"""
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import functools
+import time
+try:
+    from .data_generator import DataGen
+    from .limit_polygon import LimitPolygon
+    from .pointing_conversion import ENU, ENUBatch
+except ImportError:
+    # run as a script or with src on sys.path
+    from data_generator import DataGen
+    from limit_polygon import LimitPolygon
+    from pointing_conversion import ENU, ENUBatch
+
+# the instrumented (class, method names) pairs
+TARGETS = (
+    (ENU, ('R_east', 'R_north', 'R_up', 'R_rpy', 'from_azel', 'from_xy', 'from_enu', 'update_state')),
+    (ENUBatch, ('from_azel', 'from_xy', 'from_enu', 'update_state')),
+    (DataGen, ('test_limits', 'test_limits_array', 'point_in_polygon', 'points_in_polygon')),
+    (LimitPolygon, ('point_in_polygon', 'contains')),
+)
+
+# only one instrumentation can wrap the classes at a time
+_active = None
+
+
+class Instrumentation():
+    """
+    Count and time calls to the hot path methods while enabled.
+    """
+
+    def __init__(self, targets: Iterable[Tuple[type, Iterable[str]]] = TARGETS,
+                 callback: Optional[Callable[[Dict[str, Dict[str, float]]], None]] = None):
+        """
+        Args: the (class, method names) pairs to wrap, an optional function given the summary every time disable runs.
+        """
+        self.targets = [(cls, tuple(names)) for cls, names in targets]
+        self.callback = callback
+        self.calls = {}
+        self.seconds = {}
+        self._originals = []
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def reset(self):
+        """
+        Zero every counter.
+        """
+        for cls, names in self.targets:
+            for name in names:
+                key = f"{cls.__name__}.{name}"
+                self.calls[key] = 0
+                self.seconds[key] = 0.0
+
+    def enable(self):
+        """
+        Wrap the target methods, raises RuntimeError if another Instrumentation is enabled.
+        """
+        global _active
+        if self.enabled:
+            return
+        if _active is not None:
+            raise RuntimeError("another Instrumentation is already enabled")
+        for cls, names in self.targets:
+            for name in names:
+                original = cls.__dict__[name]
+                setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", original))
+                self._originals.append((cls, name, original))
+        _active = self
+
+    def disable(self):
+        """
+        Put the original methods back and hand the summary to the callback.
+        """
+        global _active
+        if not self.enabled:
+            return
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals = []
+        _active = None
+        if self.callback is not None:
+            self.callback(self.summary())
+
+    def _wrap(self, key: str, original):
+        """
+        Build the counting wrapper, keeping classmethod and staticmethod descriptors intact.
+        """
+        if isinstance(original, (classmethod, staticmethod)):
+            return type(original)(self._wrap(key, original.__func__))
+        calls = self.calls
+        seconds = self.seconds
+        clock = time.perf_counter
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                seconds[key] += clock() - start
+                calls[key] += 1
+        return wrapper
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns: a dict of "Class.method" to its calls, total seconds and mean seconds per call, for the methods that were called.
+        """
+        return {key: {'calls': calls, 'seconds': self.seconds[key], 'mean': self.seconds[key] / calls}
+                for key, calls in self.calls.items() if calls}
+
+    def report(self) -> str:
+        """
+        Returns: the summary as a text table, the most time first.
+        """
+        lines = [f"{'method':<32} {'calls':>10} {'total ms':>10} {'mean us':>10}"]
+        for key, row in sorted(self.summary().items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{key:<32} {row['calls']:>10} {row['seconds'] * 1e3:>10.3f} {row['mean'] * 1e6:>10.3f}")
+        return '\n'.join(lines)
+
+    def __enter__(self) -> 'Instrumentation':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
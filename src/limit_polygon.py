@@ -0,0 +1,150 @@
+from typing import Sequence, Tuple
+import numpy as np
+
+
+class LimitPolygon():
+    """
+    An arbitrary x,y limit polygon with the edge data precomputed once for repeated point tests.
+    """
+
+    def __init__(self, vertices: Sequence[Tuple[float, float]], chunk_size: int = 4096):
+        """
+        Precompute the edge start points, direction vectors, lengths and bounding boxes.
+
+        Args: the polygon vertices as a sequence of (x, y) pairs, the number of points tested per block in contains.
+              Repeated consecutive vertices, such as a closing vertex equal to the first, are dropped.
+        """
+        vertices = np.asarray(vertices, dtype=np.double).reshape(-1, 2)
+        # a repeated vertex makes a zero length edge, whose segment distance is 0 / 0
+        self.vertices = vertices[(vertices != np.roll(vertices, -1, axis=0)).any(axis=1)]
+        if self.vertices.shape[0] < 3:
+            raise ValueError(f"a limit polygon needs at least 3 distinct vertices, got {self.vertices.shape[0]}")
+        self.chunk_size = chunk_size
+        start = self.vertices
+        end = np.roll(self.vertices, -1, axis=0)
+        self.x1, self.y1 = start[:, 0], start[:, 1]
+        self.x2, self.y2 = end[:, 0], end[:, 1]
+        self.dx = self.x2 - self.x1
+        self.dy = self.y2 - self.y1
+        self.length = np.hypot(self.dx, self.dy)
+        self.length_sq = self.length**2
+        self.x_min = np.minimum(self.x1, self.x2)
+        self.x_max = np.maximum(self.x1, self.x2)
+        self.y_min = np.minimum(self.y1, self.y2)
+        self.y_max = np.maximum(self.y1, self.y2)
+        # the edge arrays of contains in float32, built on the first float32 query
+        self._float32 = None
+        # plain float rows are faster than array indexing for one point at a time
+        self.edges = list(zip(*(a.tolist() for a in (self.x1, self.y1, self.x2, self.y2, self.dx, self.dy, self.length,
+                                                     self.x_min, self.x_max, self.y_min, self.y_max))))
+
+    def __len__(self) -> int:
+        return self.vertices.shape[0]
+
+    def point_in_polygon(self, point: Tuple[float, float]) -> Tuple[bool, float]:
+        """
+        Check if a point is inside the polygon and calculate the distance to the closest edge line.
+
+        Args:
+            point (Tuple[float, float]): The point (x, y) to test.
+
+        Returns:
+            Tuple[bool, float]: A tuple containing a boolean indicating if the point is inside the polygon and the distance to the closest edge line, None when outside.
+        """
+        x, y = point
+        inside = False
+        min_distance = float('inf')
+
+        for x1, y1, x2, y2, dx, dy, length, x_min, x_max, y_min, y_max in self.edges:
+            # Ray casting algorithm to determine if the point is inside
+            if (y1 > y) != (y2 > y) and x < dx * (y - y1) / dy + x1:
+                inside = not inside
+
+            # Calculate distance to the current edge line
+            distance = abs(dx * (y1 - y) - (x1 - x) * dy) / length
+
+            # Check if the point is on the edge
+            if distance < 1e-9 and x_min <= x <= x_max and y_min <= y <= y_max:
+                return True, 0  # Point is on the edge
+
+            min_distance = min(min_distance, distance)
+
+        if inside:
+            return True, min_distance
+        else:
+            return False, None
+
+    def contains(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Test a batch of points against the polygon.
+
+        Args: arrays of the x and y positions, float32 arrays are tested in float32.
+
+        Returns: a boolean array, True for points inside or on the polygon, and an array of the distances to the closest edge segment.
+        """
+        dtype = _dtype(x, y)
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=dtype), np.asarray(y, dtype=dtype))
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        inside = np.empty(x.size, dtype=bool)
+        distance = np.empty(x.size, dtype=dtype)
+        for start in range(0, x.size, self.chunk_size):
+            block = slice(start, start + self.chunk_size)
+            inside[block], distance[block] = self._contains_block(x[block, None], y[block, None])
+        return inside.reshape(shape), distance.reshape(shape)
+
+    def nearest_edge(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Find the closest edge segment of every point.
+
+        Args: arrays of the x and y positions, float32 arrays are tested in float32.
+
+        Returns: an integer array of edge indices, edge i runs from vertex i to vertex i + 1.
+        """
+        dtype = _dtype(x, y)
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=dtype), np.asarray(y, dtype=dtype))
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        edge = np.empty(x.size, dtype=np.intp)
+        for start in range(0, x.size, self.chunk_size):
+            block = slice(start, start + self.chunk_size)
+            edge[block] = self._segment_distance(x[block, None], y[block, None]).argmin(axis=1)
+        return edge.reshape(shape)
+
+    def _segment_distance(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        The (M, N) distances from an (M, 1) block of points to the closest point on each edge segment.
+        """
+        x1, y1, _, _, dx, dy, length_sq = self._edge_arrays(x.dtype)
+        t = np.clip(((x - x1) * dx + (y - y1) * dy) / length_sq, 0.0, 1.0)
+        return np.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+    def _edge_arrays(self, dtype) -> Tuple[np.ndarray, ...]:
+        """
+        The x1, y1, x2, y2, dx, dy and squared length edge arrays in the precision of the points.
+        """
+        if dtype != np.float32:
+            return self.x1, self.y1, self.x2, self.y2, self.dx, self.dy, self.length_sq
+        if self._float32 is None:
+            self._float32 = tuple(a.astype(np.float32) for a in (self.x1, self.y1, self.x2, self.y2, self.dx, self.dy, self.length_sq))
+        return self._float32
+
+    def _contains_block(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Test one (M, 1) block of points against every (N,) edge at once.
+        """
+        x1, y1, _, y2, dx, dy, _ = self._edge_arrays(x.dtype)
+        # ray casting; an edge that straddles the point's y can not be horizontal, so dy is never 0 where it counts
+        straddle = (y1 > y) != (y2 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = dx * (y - y1) / dy + x1
+        crossings = np.count_nonzero(straddle & (x < x_cross), axis=1)
+        distance = self._segment_distance(x, y).min(axis=1)
+        return (crossings % 2 == 1) | (distance < 1e-9), distance
+
+
+def _dtype(x, y):
+    """
+    float32 when both coordinate arrays are float32, float64 otherwise.
+    """
+    return np.float32 if np.asarray(x).dtype == np.float32 and np.asarray(y).dtype == np.float32 else np.double
@@ -0,0 +1,237 @@
+"""
+Precomputed az/el <-> x/y lookup grids with bilinear or bicubic interpolation.
+
+The az/el grid holds x and y directly. The x/y grid holds the east, north, up vector instead of az and el,
+since az wraps at 360 and is undefined at the zenith; the interpolated vector is turned back into az, el.
+
+Error bound: interpolation error grows with the square (bilinear) or the cube (bicubic) of the grid step and with the
+curvature of the mapping, which is largest next to the x/y keyholes on the horizon. The table measures its own error
+when it is built, against the closed form conversion at three points inside every grid cell and a 16 x 16 sample of the
+worst cells. That is a sampled estimate, not a proof, as the worst point of a cell can fall between the samples, so
+self.error_bound keeps the largest error found times SAFETY. Azimuth errors are counted as the angle they subtend on the sky,
+az error * cos(el), since az is undefined at the zenith. Largest errors found for the defaults (step 0.25 deg, el_min 2 deg),
+before the safety factor, in degrees:
+    az/el -> x/y  bilinear 6.4e-2, bicubic 5.5e-3, set by the keyhole cells at el_min near az 0 and 180
+                  (1.0e-2 and 3.2e-4 with el_min 5; away from the keyholes both are below 1e-4)
+    x/y -> az/el  bilinear 6.8e-5, bicubic 1.1e-7
+Elevations below el_min are outside the grid and fall back to the closed form conversion.
+"""
+from typing import Dict, Tuple
+import numpy as np
+try:
+    from .pointing_conversion import azel_to_xy_array, xy_to_azel_array
+except ImportError:
+    # run as a script or with src on sys.path
+    from pointing_conversion import azel_to_xy_array, xy_to_azel_array
+
+# layout of the header at the front of the saved array
+_MAGIC = 26.1962
+_HEADER = ('magic', 'version', 'step', 'el_min', 'n_az', 'n_el', 'n_xy',
+           'azel_bilinear', 'azel_bicubic', 'xy_bilinear', 'xy_bicubic')
+_HEADER_SIZE = 16
+_VERSION = 2
+METHODS = ('bilinear', 'bicubic')
+# the stored error bound is the largest sampled error times this factor, the samples can miss the worst point of a cell
+SAFETY = 1.5
+
+
+class LookupTable():
+    """
+    Az/el <-> x/y conversion answered from precomputed grids.
+    """
+
+    def __init__(self, step: float = 0.25, el_min: float = 2.0, _data: np.ndarray = None):
+        """
+        Build the grids, or wrap a loaded array when _data is given.
+
+        Args: the grid step in degrees, the lowest elevation covered by the az/el grid.
+        """
+        if _data is None:
+            _data = self._build(step, el_min)
+        header = dict(zip(_HEADER, _data[:len(_HEADER)].tolist()))
+        if header['magic'] != _MAGIC or int(header['version']) != _VERSION:
+            raise ValueError("not a lookup table array")
+        self.data = _data
+        self.step = header['step']
+        self.el_min = header['el_min']
+        n_az, n_el, n_xy = int(header['n_az']), int(header['n_el']), int(header['n_xy'])
+        self.az_step = 360.0 / (n_az - 1)
+        self.el_step = (90.0 - self.el_min) / (n_el - 1)
+        self.xy_step = 180.0 / (n_xy - 1)
+        self.n_az, self.n_el, self.n_xy = n_az, n_el, n_xy
+        # zero copy views into the (possibly memory mapped) array, every grid has one extra node on each side
+        offset = _HEADER_SIZE
+        size = (n_az + 2) * (n_el + 2)
+        self.x_grid, self.y_grid = _data[offset:offset + 2 * size].reshape(2, n_az + 2, n_el + 2)
+        offset += 2 * size
+        size = (n_xy + 2) * (n_xy + 2)
+        self.enu_grid = _data[offset:offset + 3 * size].reshape(3, n_xy + 2, n_xy + 2)
+        self.error_bound = {
+            ('azel2xy', 'bilinear'): header['azel_bilinear'], ('azel2xy', 'bicubic'): header['azel_bicubic'],
+            ('xy2azel', 'bilinear'): header['xy_bilinear'], ('xy2azel', 'bicubic'): header['xy_bicubic'],
+        }
+
+    @classmethod
+    def _build(cls, step: float, el_min: float) -> np.ndarray:
+        if not (0.0 < step <= 10.0):
+            raise ValueError(f"the grid step must be in (0, 10] degrees, got {step}")
+        if not (0.0 < el_min < 90.0):
+            raise ValueError(f"el_min must be in (0, 90) degrees, got {el_min}")
+        n_az = int(round(360.0 / step)) + 1
+        n_el = int(round((90.0 - el_min) / step)) + 1
+        n_xy = int(round(180.0 / step)) + 1
+        # the formulas continue smoothly past the grid edges (az < 0, el > 90, |x| > 90 ...), so the extra
+        # nodes around every grid are exact values that keep bicubic stencils from being clipped at the edges
+        az, el = np.meshgrid(_padded_axis(0.0, 360.0, n_az), _padded_axis(el_min, 90.0, n_el), indexing='ij')
+        x, y = np.meshgrid(_padded_axis(-90.0, 90.0, n_xy), _padded_axis(-90.0, 90.0, n_xy), indexing='ij')
+        x, y = np.radians(x), np.radians(y)
+        cos_y = np.cos(y)
+        enu = np.stack((np.sin(x) * cos_y, np.sin(y), np.cos(x) * cos_y))
+        header = np.zeros(_HEADER_SIZE)
+        header[:7] = (_MAGIC, _VERSION, step, el_min, n_az, n_el, n_xy)
+        data = np.concatenate((header, np.stack(azel_to_xy_array(az, el)).ravel(), enu.ravel()))
+        table = cls(_data=data)
+        data[7:11] = np.multiply(table._measure_errors(), SAFETY)
+        return data
+
+    def _measure_errors(self) -> Tuple[float, float, float, float]:
+        """
+        The largest interpolation error found inside the grid cells, in degrees, without the safety factor.
+
+        Every cell is sampled at its centre and two diagonal points, then the cells with the largest errors are sampled again at 16 x 16 points.
+        """
+        def xy_error(approx, exact):
+            return np.maximum(*(np.abs(a - e) for a, e in zip(approx, exact)))
+
+        def azel_error(approx, exact):
+            # az errors are scaled to the angle they subtend on the sky, az has no meaning at the zenith
+            az_error = np.abs((approx[0] - exact[0] + 180.0) % 360.0 - 180.0) * np.cos(np.radians(exact[1]))
+            return np.maximum(az_error, np.abs(approx[1] - exact[1]))
+
+        errors = []
+        for method in METHODS:
+            errors.append(_worst_error(lambda az, el: self.azel_to_xy(az, el, method), azel_to_xy_array, xy_error,
+                                       (0.0, self.az_step, self.n_az), (self.el_min, self.el_step, self.n_el)))
+        for method in METHODS:
+            errors.append(_worst_error(lambda x, y: self.xy_to_azel(x, y, method), xy_to_azel_array, azel_error,
+                                       (-90.0, self.xy_step, self.n_xy), (-90.0, self.xy_step, self.n_xy)))
+        return tuple(errors)
+
+    def azel_to_xy(self, az: np.ndarray, el: np.ndarray, method: str = 'bilinear') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolate x, y for arrays of az, el.
+
+        Args: arrays of azimuth and elevation in degrees, "bilinear" or "bicubic".
+
+        Returns: the x and y arrays in degrees.
+        """
+        az, el = np.broadcast_arrays(np.asarray(az, dtype=np.double), np.asarray(el, dtype=np.double))
+        u = (az % 360.0) / self.az_step
+        v = (np.minimum(el, 90.0) - self.el_min) / self.el_step
+        x, y = _interpolate((self.x_grid, self.y_grid), u, v, method)
+        low = el < self.el_min
+        if np.any(low):
+            x[low], y[low] = azel_to_xy_array(az[low], el[low])
+        return x, y
+
+    def xy_to_azel(self, x: np.ndarray, y: np.ndarray, method: str = 'bilinear') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolate az, el for arrays of x, y.
+
+        Args: arrays of x and y in degrees, "bilinear" or "bicubic".
+
+        Returns: the azimuth and elevation arrays in degrees.
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.double), np.asarray(y, dtype=np.double))
+        u = (np.clip(x, -90.0, 90.0) + 90.0) / self.xy_step
+        v = (np.clip(y, -90.0, 90.0) + 90.0) / self.xy_step
+        east, north, up = _interpolate(tuple(self.enu_grid), u, v, method)
+        az = (np.degrees(np.arctan2(east, north)) + 360) % 360
+        el = np.degrees(np.arctan2(up, np.hypot(east, north)))
+        return az, el
+
+    def save(self, path: str):
+        """
+        Write the table as a single .npy file that load can memory map.
+        """
+        np.save(path, np.asarray(self.data))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'LookupTable':
+        """
+        Load a saved table, memory mapped read only by default so processes share one copy.
+        """
+        return cls(_data=np.load(path, mmap_mode='r' if mmap else None))
+
+    def stats(self) -> Dict[str, float]:
+        return {'step': self.step, 'el_min': self.el_min, 'nbytes': self.data.nbytes,
+                **{f"{direction}_{method}": error for (direction, method), error in self.error_bound.items()}}
+
+
+def _worst_error(approx, exact, error, u_axis: Tuple[float, float, int], v_axis: Tuple[float, float, int], refine: int = 1024) -> float:
+    """
+    Search the cells of a grid for the largest interpolation error.
+
+    Args: the interpolating and exact conversions, an error(approx, exact) function, the (start, step, count) of both grid axes,
+          the number of worst cells sampled again more finely.
+    """
+    (u_start, u_step, n_u), (v_start, v_step, n_v) = u_axis, v_axis
+    u = u_start + u_step * np.arange(n_u - 1)
+    v = v_start + v_step * np.arange(n_v - 1)
+    cell_error = np.zeros((n_u - 1, n_v - 1))
+    for du, dv in ((0.5, 0.5), (0.25, 0.25), (0.75, 0.75)):
+        points = np.meshgrid(u + du * u_step, v + dv * v_step, indexing='ij')
+        np.maximum(cell_error, error(approx(*points), exact(*points)), out=cell_error)
+    worst_cells = np.argsort(cell_error, axis=None)[-refine:]
+    i, j = np.unravel_index(worst_cells, cell_error.shape)
+    offsets = (np.arange(16) + 0.5) / 16
+    du, dv = np.meshgrid(offsets, offsets, indexing='ij')
+    points = (u[i, None] + du.ravel() * u_step, v[j, None] + dv.ravel() * v_step)
+    return float(max(cell_error.max(), error(approx(*points), exact(*points)).max()))
+
+
+def _padded_axis(start: float, stop: float, count: int) -> np.ndarray:
+    """
+    count evenly spaced nodes from start to stop plus one more node beyond each end.
+    """
+    step = (stop - start) / (count - 1)
+    return start + step * np.arange(-1, count + 1)
+
+
+def _interpolate(grids: Tuple[np.ndarray, ...], u: np.ndarray, v: np.ndarray, method: str) -> Tuple[np.ndarray, ...]:
+    """
+    Interpolate several padded grids sharing the same axes at fractional node coordinates u, v.
+    """
+    n_u, n_v = grids[0].shape
+    i = np.clip(np.floor(u).astype(np.intp), 0, n_u - 4)
+    j = np.clip(np.floor(v).astype(np.intp), 0, n_v - 4)
+    s = u - i
+    t = v - j
+    # flat index of node (i, j) in the padded grid, np.take on a flat view is the fastest gather
+    base = (i + 1) * n_v + (j + 1)
+    flats = [grid.reshape(-1) for grid in grids]
+    if method == 'bilinear':
+        weights = ((1 - s) * (1 - t), s * (1 - t), (1 - s) * t, s * t)
+        offsets = (0, n_v, 1, n_v + 1)
+        return tuple(sum(w * flat.take(base + offset) for w, offset in zip(weights, offsets)) for flat in flats)
+    if method != 'bicubic':
+        raise ValueError(f"unknown interpolation method: {method}")
+    s_weights = _catmull_rom(s)
+    t_weights = _catmull_rom(t)
+    results = []
+    for flat in flats:
+        total = 0.0
+        for row, s_weight in zip((-1, 0, 1, 2), s_weights):
+            row_base = base + row * n_v
+            total = total + s_weight * sum(t_weight * flat.take(row_base + col) for col, t_weight in zip((-1, 0, 1, 2), t_weights))
+        results.append(total)
+    return tuple(results)
+
+
+def _catmull_rom(t: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Cubic convolution weights of the four neighbours for a fractional position t in [0, 1].
+    """
+    t2 = t * t
+    t3 = t2 * t
+    return ((-t3 + 2 * t2 - t) / 2, (3 * t3 - 5 * t2 + 2) / 2, (-3 * t3 + 4 * t2 + t) / 2, (t3 - t2) / 2)
@@ -0,0 +1,128 @@
+"""
+Fixed mount corrections (tilt, misalignment) applied to whole arrays of pointings with one matrix product.
+
+Rotations follow the row vector convention of ENU.R_north, R_up and R_rpy: a vector is corrected as v @ M, so corrections
+applied one after another, v @ M1 @ M2 @ ..., collapse into the single matrix M1 @ M2 @ ... that is built once.
+"""
+from typing import Tuple
+import numpy as np
+try:
+    from .pointing_conversion import ENU, rpy_matrix
+except ImportError:
+    # run as a script or with src on sys.path
+    from pointing_conversion import ENU, rpy_matrix
+
+FRAMES = ('azel', 'xy')
+
+
+class MountModel():
+    """
+    A fixed chain of rotations held as one 3x3 matrix.
+    """
+
+    def __init__(self, matrix: np.ndarray = None):
+        """
+        Args: the 3x3 row vector convention matrix, the identity by default.
+        """
+        matrix = np.eye(3) if matrix is None else np.array(matrix, dtype=np.double)
+        if matrix.shape != (3, 3):
+            raise ValueError(f"a mount model matrix must be 3x3, got {matrix.shape}")
+        matrix.setflags(write=False)
+        self.matrix = matrix
+
+    @classmethod
+    def rpy(cls, psi: float, phi: float, theta: float) -> 'MountModel':
+        """
+        The roll (psi), pitch (phi), yaw (theta) rotation of ENU.R_rpy, in degrees.
+        """
+        return cls(rpy_matrix(psi, phi, theta))
+
+    @classmethod
+    def east(cls, theta: float) -> 'MountModel':
+        """
+        The rotation of ENU.R_east, which multiplies from the left, so its matrix is transposed here.
+        """
+        return cls(ENU._east_matrix(theta).T)
+
+    @classmethod
+    def north(cls, theta: float) -> 'MountModel':
+        """
+        The rotation of ENU.R_north.
+        """
+        return cls(ENU._north_matrix(theta))
+
+    @classmethod
+    def up(cls, theta: float) -> 'MountModel':
+        """
+        The rotation of ENU.R_up.
+        """
+        return cls(ENU._up_matrix(theta))
+
+    @classmethod
+    def chain(cls, *models: 'MountModel') -> 'MountModel':
+        """
+        One model applying the given models in order.
+        """
+        matrix = np.eye(3)
+        for model in models:
+            matrix = matrix @ model.matrix
+        return cls(matrix)
+
+    def then(self, other: 'MountModel') -> 'MountModel':
+        """
+        This model followed by other.
+        """
+        return MountModel(self.matrix @ other.matrix)
+
+    def inverse(self) -> 'MountModel':
+        """
+        The model undoing this one, the transpose of a rotation.
+        """
+        return MountModel(self.matrix.T)
+
+    def apply(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Correct an (N, 3) array of east, north, up vectors.
+        """
+        return np.asarray(vectors, dtype=np.double) @ self.matrix
+
+    def correct(self, first: np.ndarray, second: np.ndarray, frame: str = 'azel', output: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Correct arrays of pointings.
+
+        Args: the first and second angle arrays in degrees, the input frame "azel" or "xy", the output frame, the input frame by default.
+
+        Returns: the two corrected angle arrays in degrees, az, el or x, y.
+        """
+        output = frame if output is None else output
+        if frame not in FRAMES or output not in FRAMES:
+            raise ValueError(f"frames must be one of {FRAMES}, got {frame} and {output}")
+        east, north, up = _vectors(first, second, frame)
+        matrix = self.matrix
+        # v @ M written out per component, no (N, 3) stack is built
+        corrected = (east * matrix[0, i] + north * matrix[1, i] + up * matrix[2, i] for i in range(3))
+        return _angles(*corrected, output)
+
+    def __repr__(self) -> str:
+        return f"MountModel({self.matrix.tolist()})"
+
+
+def _vectors(first: np.ndarray, second: np.ndarray, frame: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The east, north, up components of az, el or x, y pointings.
+    """
+    first = np.radians(np.asarray(first, dtype=np.double))
+    second = np.radians(np.asarray(second, dtype=np.double))
+    cos_second = np.cos(second)
+    if frame == 'azel':
+        return np.sin(first) * cos_second, np.cos(first) * cos_second, np.sin(second)
+    return np.sin(first) * cos_second, np.sin(second), np.cos(first) * cos_second
+
+
+def _angles(east: np.ndarray, north: np.ndarray, up: np.ndarray, frame: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The az, el or x, y angles of unit vectors.
+    """
+    if frame == 'azel':
+        return (np.degrees(np.arctan2(east, north)) + 360) % 360, np.degrees(np.arcsin(np.clip(up, -1.0, 1.0)))
+    return np.degrees(np.arctan2(east, up)), np.degrees(np.arcsin(np.clip(north, -1.0, 1.0)))
@@ -0,0 +1,96 @@
+"""
+X/Y conversions for targets at a finite range, with the Y axis offset from the X axis.
+
+On the 26M the Y axis sits 23 ft above the X axis. The X axis turns the Y axis with it, so the Y axis centre is
+    P = R_north(x) @ [0, 0, d] = d (sin x, 0, cos x)
+and the boresight leaves P along b = (sin x cos y, sin y, cos x cos y). A target T, given as az, el and range from the
+X axis centre (the surveyed point), is on the boresight when T = P + s b for a slant range s > 0.
+
+P lies along (sin x, 0, cos x), the same east-up direction as b, so the offset never moves x:
+    x = atan2(T_e - d sin x, T_u - d cos x)
+has the fixed point x = atan2(T_e, T_u), reached on the first step. Only y sees the parallax,
+    y = atan2(T_n, hypot(T_e, T_u) - d)
+which shifts y towards the horizon by atan(d sin y / (range - d cos y)), about d / range radians at most:
+0.40 deg at 1 km, 4.0e-4 deg at 1000 km. The inverse is closed form too, |P + s b| = range is a quadratic in s
+    s = sqrt(range^2 - d^2 sin^2 y) - d cos y
+Both directions work on whole arrays and take about 1.3 times as long as the zero offset azel_to_xy_array and xy_to_azel_array,
+see benchmarks/run_benchmarks.py.
+"""
+from typing import Tuple
+import numpy as np
+
+# the distance from the centre line of the X axis to the centre line of the Y axis, 23.00 ft
+Y_OFFSET = 23.0 * 0.3048
+
+
+class OffsetAxisModel():
+    """
+    Az/el/range <-> x/y for an X/Y mount whose Y axis is offset from the X axis.
+    """
+
+    def __init__(self, offset: float = Y_OFFSET):
+        """
+        Args: the Y axis offset from the X axis in meters, along the boresight at x = y = 0.
+        """
+        self.offset = float(offset)
+
+    def enu_to_xy(self, e: np.ndarray, n: np.ndarray, u: np.ndarray, dtype=np.double) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The x, y that point the boresight at targets given in meters east, north and up of the X axis centre.
+
+        Returns: the x and y arrays in degrees, |y| is past 90 for targets closer to the X axis line than the offset.
+        """
+        e, n, u = (np.asarray(c, dtype=dtype) for c in (e, n, u))
+        return np.degrees(np.arctan2(e, u)), np.degrees(np.arctan2(n, np.hypot(e, u) - self.offset))
+
+    def azel_to_xy(self, az: np.ndarray, el: np.ndarray, rng: np.ndarray, dtype=np.double) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of az, el and range to x, y.
+
+        Args: arrays of azimuth and elevation in degrees, the range in meters from the X axis centre.
+
+        Returns: the x and y arrays in degrees.
+        """
+        az = np.radians(np.asarray(az, dtype=dtype))
+        el = np.radians(np.asarray(el, dtype=dtype))
+        rng = np.asarray(rng, dtype=dtype)
+        horizontal = rng * np.cos(el)
+        return self.enu_to_xy(horizontal * np.sin(az), horizontal * np.cos(az), rng * np.sin(el), dtype)
+
+    def xy_to_enu(self, x: np.ndarray, y: np.ndarray, rng: np.ndarray, dtype=np.double) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The east, north, up position of the target on the boresight at the given range from the X axis centre.
+
+        Returns: the e, n, u arrays in meters, NaN where the range is within the offset.
+        """
+        x = np.radians(np.asarray(x, dtype=dtype))
+        y = np.radians(np.asarray(y, dtype=dtype))
+        rng = np.asarray(rng, dtype=dtype)
+        sin_y, cos_y = np.sin(y), np.cos(y)
+        # |P + s b|^2 = range^2 with P.b = d cos y, the positive root
+        with np.errstate(invalid='ignore'):
+            slant = np.sqrt(rng * rng - (self.offset * sin_y) ** 2) - self.offset * cos_y
+        slant = np.where(rng > self.offset, slant, np.nan)
+        radial = self.offset + slant * cos_y
+        return radial * np.sin(x), slant * sin_y, radial * np.cos(x)
+
+    def xy_to_azel(self, x: np.ndarray, y: np.ndarray, rng: np.ndarray, dtype=np.double) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of x, y and the target range back to az, el.
+
+        Args: arrays of x and y in degrees, the range in meters from the X axis centre.
+
+        Returns: the azimuth and elevation arrays in degrees, NaN where the range is within the offset.
+        """
+        e, n, u = self.xy_to_enu(x, y, rng, dtype)
+        az = (np.degrees(np.arctan2(e, n)) + 360) % 360
+        el = np.degrees(np.arctan2(u, np.hypot(e, n)))
+        return az, el
+
+    def parallax(self, az: np.ndarray, el: np.ndarray, rng: np.ndarray) -> np.ndarray:
+        """
+        The change in y the offset causes, offset y minus the zero offset y, in degrees; x does not change.
+        """
+        _, y = self.azel_to_xy(az, el, rng)
+        _, y_far = OffsetAxisModel(0.0).azel_to_xy(az, el, 1.0)
+        return y - y_far
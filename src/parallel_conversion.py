@@ -0,0 +1,121 @@
+"""
+Split large az/el <-> x/y conversions across a process pool.
+
+The input and output arrays live in shared memory, workers are only sent (start, stop) block bounds,
+so nothing but the block positions is pickled. Every block writes to its own slice, the output order is the input order.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+import os
+import numpy as np
+try:
+    from .track_pipeline import convert_chunk
+except ImportError:
+    # run as a script or with src on sys.path
+    from track_pipeline import convert_chunk
+
+# per worker process views of the shared buffers, set by _attach
+_worker_state = {}
+
+
+def _attach(in_name: str, out_name: str, capacity: int):
+    """
+    Pool initializer, map the shared input and output buffers into this worker.
+    """
+    buffers = []
+    for name in (in_name, out_name):
+        # pool workers share the parent's resource tracker, so attaching here does not change who unlinks the segment
+        buffers.append(shared_memory.SharedMemory(name=name))
+    _worker_state['buffers'] = buffers
+    _worker_state['input'] = np.ndarray((2, capacity), dtype=np.double, buffer=buffers[0].buf)
+    _worker_state['output'] = np.ndarray((2, capacity), dtype=np.double, buffer=buffers[1].buf)
+
+
+def _convert_block(start: int, stop: int, direction: str) -> int:
+    """
+    Convert one block of the shared input into the same block of the shared output.
+    """
+    first, second = _worker_state['input'][:, start:stop]
+    out_first, out_second = convert_chunk(first, second, direction)
+    _worker_state['output'][0, start:stop] = out_first
+    _worker_state['output'][1, start:stop] = out_second
+    return start
+
+
+class ParallelConverter():
+    """
+    A process pool with shared input and output buffers that are reused for every convert call.
+    """
+
+    def __init__(self, workers: Optional[int] = None, capacity: int = 1 << 20, block_size: int = 1 << 16):
+        """
+        Args: the number of worker processes (default os.cpu_count()), the most samples one convert call takes,
+              the number of samples handed to a worker at a time.
+        """
+        if capacity < 1 or block_size < 1:
+            raise ValueError(f"capacity and block_size must be at least 1, got {capacity} and {block_size}")
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = capacity
+        self.block_size = block_size
+        nbytes = 2 * capacity * np.dtype(np.double).itemsize
+        self._in_shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._out_shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._input = np.ndarray((2, capacity), dtype=np.double, buffer=self._in_shm.buf)
+        self._output = np.ndarray((2, capacity), dtype=np.double, buffer=self._out_shm.buf)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach,
+                                         initargs=(self._in_shm.name, self._out_shm.name, capacity))
+
+    def convert(self, first: np.ndarray, second: np.ndarray, direction: str = 'azel2xy') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of angles on the pool.
+
+        Args: the first and second input angle arrays in degrees, either "azel2xy" or "xy2azel".
+
+        Returns: the two converted angle arrays in degrees, in input order.
+        """
+        first = np.asarray(first, dtype=np.double).ravel()
+        second = np.asarray(second, dtype=np.double).ravel()
+        count = first.size
+        if second.size != count:
+            raise ValueError(f"input lengths differ: {count} and {second.size}")
+        if count > self.capacity:
+            raise ValueError(f"{count} samples exceed the converter capacity of {self.capacity}")
+        self._input[0, :count] = first
+        self._input[1, :count] = second
+        futures = [self._pool.submit(_convert_block, start, min(start + self.block_size, count), direction)
+                   for start in range(0, count, self.block_size)]
+        for future in futures:
+            # re-raises any worker error
+            future.result()
+        return self._output[0, :count].copy(), self._output[1, :count].copy()
+
+    def close(self):
+        """
+        Stop the workers and release the shared memory.
+        """
+        self._pool.shutdown()
+        for shm in (self._in_shm, self._out_shm):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_parallel(first: np.ndarray, second: np.ndarray, direction: str = 'azel2xy', workers: Optional[int] = None,
+                     block_size: int = 1 << 16) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert one large batch of angles on a temporary process pool.
+
+    Args: the first and second input angle arrays in degrees, either "azel2xy" or "xy2azel",
+          the number of worker processes, the number of samples handed to a worker at a time.
+
+    Returns: the two converted angle arrays in degrees, in input order.
+    """
+    first = np.asarray(first, dtype=np.double).ravel()
+    with ParallelConverter(workers, capacity=max(first.size, 1), block_size=block_size) as converter:
+        return converter.convert(first, second, direction)
@@ -2,16 +2,29 @@
 import tkinter as tk
 from tkinter import filedialog, Menu
 from tkinter import ttk
-import matplotlib.pyplot as plt
+# the Figure class directly rather than through pyplot, which loads every backend helper; polars is only imported
+# when a file is opened
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.collections import PathCollection
-import polars as pl
 import numpy as np
 
-from data_generator import DataGen
+try:
+    from .contour_cache import ContourCache
+    from .contour_job import ContourJob, diff_rows, format_rows
+    from .contour_export import write_csv
+except ImportError:
+    # run as a script or with src on sys.path
+    from contour_cache import ContourCache
+    from contour_job import ContourJob, diff_rows, format_rows
+    from contour_export import write_csv
 
 
 class MatplotlibTk(tk.Tk):
+    # table rows changed per event loop pass, and how often a running contour job is polled in ms
+    TREE_CHUNK = 2000
+    POLL_MS = 50
+
     def __init__(self):
         tk.Tk.__init__(self)
 
@@ -64,6 +77,12 @@ class MatplotlibTk(tk.Tk):
         self.y_max_limit_label.pack(side=tk.LEFT)
         self.y_max_limit_entry = tk.Entry(self.limit_frame, textvariable=self.y_max_value)
         self.y_max_limit_entry.pack(side=tk.LEFT)
+        self.resolution_value = tk.DoubleVar()
+        self.resolution_value.set(1.0)
+        self.resolution_label = tk.Label(self.limit_frame, text="Az Step:")
+        self.resolution_label.pack(side=tk.LEFT)
+        self.resolution_entry = tk.Entry(self.limit_frame, textvariable=self.resolution_value, width=6)
+        self.resolution_entry.pack(side=tk.LEFT)
         # add a button to regenerate the limit data
         self.regenerate_button = tk.Button(self.limit_frame, text="Regenerate", command=self.generate_data)
         self.regenerate_button.pack(side=tk.LEFT)
@@ -71,9 +90,27 @@ class MatplotlibTk(tk.Tk):
         self.legacy_var = tk.BooleanVar(value=False)
         self.legacy_check = ttk.Checkbutton(self.limit_frame, text="Legacy limits", variable=self.legacy_var)
         self.legacy_check.pack(side=tk.LEFT)
+        # previously generated contours are served from the cache
+        self.contour_cache = ContourCache()
+        # the last contour warm starts the next one when a limit is nudged
+        self.last_contour = None
+        self.last_mode = None
+        self.cache_label = tk.Label(self.limit_frame, text="")
+        self.cache_label.pack(side=tk.LEFT)
+        # contours are generated on a worker thread, the event loop polls it
+        self.job = None
+        self.progress_bar = ttk.Progressbar(self.limit_frame, length=120, maximum=1.0)
+        self.progress_bar.pack(side=tk.LEFT)
+        self.cancel_button = tk.Button(self.limit_frame, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT)
+        # the contour on display, the line drawing it and the rows the table shows
+        self.contour = None
+        self.contour_line = None
+        self.tree_rows = None
+        self._tree_token = None
 
         # Initialize plotting area
-        self.plot_figure = plt.Figure(figsize=(5, 4), dpi=100)
+        self.plot_figure = Figure(figsize=(5, 4), dpi=100)
         self.plot_ax = self.plot_figure.add_subplot(111)
 
         # Set up canvas to display plots
@@ -128,16 +165,50 @@ class MatplotlibTk(tk.Tk):
     def update_treeview(self):
         """
         Update the treeview using our current limit data set.
+
+        Only the rows whose shown values changed are touched, row i is always item "i", and the work is split into
+        TREE_CHUNK sized steps run from the event loop so a 36,000 row contour does not freeze the window.
         """
-        if hasattr(self, 'limit_data_tree'):
-            self.limit_data_tree.delete(*self.limit_data_tree.get_children())
-            for row in self.data.rows():
-                az, el = row
-                el = round(el, 3)
-                self.limit_data_tree.insert("", tk.END, values=[az, el])
-        else:
+        if not hasattr(self, 'limit_data_tree') or self.contour is None:
             # first run no treeview exists yet
-            pass
+            return
+        changed, appended, deleted = diff_rows(self.tree_rows, self.contour)
+        self._tree_token = token = object()
+        self._apply_tree_steps(token, self._tree_steps(self.contour, changed, appended, deleted))
+
+    def _tree_steps(self, rows, changed, appended, deleted):
+        """
+        Apply a diff_rows update one chunk per step, keeping self.tree_rows equal to what the table shows.
+        """
+        tree = self.limit_data_tree
+        common = rows.shape[0] - appended
+        if deleted:
+            tree.delete(*[str(i) for i in range(common, common + deleted)])
+            self.tree_rows = self.tree_rows[:common]
+            yield
+        for start in range(0, changed.size, self.TREE_CHUNK):
+            block = changed[start:start + self.TREE_CHUNK]
+            for index, values in zip(block.tolist(), format_rows(rows, block)):
+                tree.item(str(index), values=values)
+            self.tree_rows[block] = rows[block]
+            yield
+        for start in range(common, common + appended, self.TREE_CHUNK):
+            block = np.arange(start, min(start + self.TREE_CHUNK, common + appended))
+            for index, values in zip(block.tolist(), format_rows(rows, block)):
+                tree.insert("", tk.END, iid=str(index), values=values)
+            added = np.array(rows[block], dtype=np.double)
+            self.tree_rows = added if self.tree_rows is None else np.concatenate((self.tree_rows, added))
+            yield
+
+    def _apply_tree_steps(self, token, steps):
+        if token is not self._tree_token:
+            # a newer update took over, it starts from the rows shown now
+            return
+        try:
+            next(steps)
+        except StopIteration:
+            return
+        self.after(1, self._apply_tree_steps, token, steps)
 
     def on_tree_select(self, event):
         """
@@ -162,6 +233,7 @@ class MatplotlibTk(tk.Tk):
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
+                import polars as pl
                 data = pl.read_csv(file_path)
 
                 if len(data.columns) == 2:  # Cartesian plot
@@ -181,30 +253,67 @@ class MatplotlibTk(tk.Tk):
                                                  filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                self.data.write_csv(file_path)
+                write_csv(file_path, self.contour)
 
             except Exception as e:
                 print(f"Error saving file: {e}")
 
     def generate_data(self):
         """
-        Generate limit data for the x,y antenna.
+        Generate limit data for the x,y antenna on a worker thread, a job still running is cancelled.
         """
         x_lims = (self.x_min_value.get(), self.x_max_value.get())
         y_lims = (self.y_min_value.get(), self.y_max_value.get())
-        lims = DataGen((x_lims, y_lims))
-        if self.legacy_var.get():
-            lims.find_from_point()
-        else:
-            lims.find_limits()
-
-        self.data = pl.DataFrame(lims.limit_list, orient='row', schema=['az', 'el'])
-        theta = self.data[self.data.columns[0]] * np.pi / 180  # Convert 'az' to radians
-        r = self.data[self.data.columns[1]]
-
-        if self.plot_ax is None:
-            fig = plt.figure(figsize=(5, 4), dpi=100)
-            self.plot_ax = fig.add_subplot(111, projection='polar')
+        mode = "polygon" if self.legacy_var.get() else "limits"
+        previous = self.last_contour if mode == self.last_mode else None
+        self.cancel_job()
+        self.job = ContourJob(self.contour_cache, (x_lims, y_lims), mode, self.resolution_value.get(), previous).start()
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_bar['value'] = 0.0
+        self.after(self.POLL_MS, self._poll_job, self.job)
+
+    def cancel_job(self):
+        """
+        Stop the running contour job, the last contour stays on display.
+        """
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def _poll_job(self, job):
+        if job is not self.job:
+            # cancelled or replaced
+            return
+        self.progress_bar['value'] = job.progress
+        if not job.done:
+            self.after(self.POLL_MS, self._poll_job, job)
+            return
+        self.job = None
+        self.cancel_button.config(state=tk.DISABLED)
+        if job.error is not None:
+            print(f"Error generating data: {job.error}")
+        elif job.result is not None:
+            self.show_contour(job.result, job.arguments['mode'])
+
+    def show_contour(self, contour, mode):
+        """
+        Display a contour; the plot line is updated in place and the table is diffed.
+        """
+        self.last_contour, self.last_mode = contour, mode
+        self.contour = contour
+        stats = self.contour_cache.stats()
+        self.cache_label.config(text=f"cache hits: {stats['hits']}, misses: {stats['misses']}")
+
+        # close the plot line, one buffer with the first row repeated at the end
+        closed = np.empty((contour.shape[0] + 1, 2), order='F')
+        closed[:-1] = contour
+        closed[-1] = contour[0]
+        theta = np.radians(closed[:, 0], out=closed[:, 0])
+        r = closed[:, 1]
+
+        if self.contour_line is not None and self.contour_line in self.plot_ax.lines:
+            self.contour_line.set_data(theta, r)
         else:
             # Check if the current axes are polar
             if 'theta_zero_location' in dir(self.plot_ax):
@@ -213,21 +322,15 @@ class MatplotlibTk(tk.Tk):
                 # Create a new polar subplot and update the canvas
                 self.plot_figure.clear()
                 self.plot_ax = self.plot_figure.add_subplot(111, projection='polar')
+            (self.contour_line,) = self.plot_ax.plot(theta, r)
+            self.plot_ax.set_ylim(90,0)
+            self.plot_ax.set_theta_direction(-1)
+            self.plot_ax.set_theta_offset(np.pi/2)
 
-        # close the plot line
-        theta = np.append(theta, theta[0])
-        r = np.append(r, r[0])
-
-        self.plot_ax.plot(theta, r)
-        self.plot_ax.set_ylim(90,0)
-        self.plot_ax.set_theta_direction(-1)
-        self.plot_ax.set_theta_offset(np.pi/2)
-
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
         self.update_treeview()
 
-
 if __name__ == "__main__":
     app = MatplotlibTk()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+A limit set compiled into an az/el grid of cell states, so reachability is answered by array indexing.
+
+Every cell of the grid is marked inside, outside or boundary when the mask is built. The limit margin (the signed x/y
+distance to the closest limit, see VisibilityChecker.margin) changes by at most the x/y distance moved, so a cell whose
+corner margins all clear the x/y size of the cell, with a safety factor, has the same answer everywhere inside it.
+The remaining boundary cells, and points below the horizon, fall back to the exact margin test, so contains() always
+agrees with the exact test. The cells next to the x/y keyholes on the horizon at az 0 and 180 are boundary cells too, as
+their x/y size is large.
+
+The states, the header and the limit geometry are one int8 .npy file that load memory maps read only.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import hashlib
+import os
+import numpy as np
+try:
+    from .pointing_conversion import azel_to_xy_array
+    from .visibility import VisibilityChecker
+except ImportError:
+    # run as a script or with src on sys.path
+    from pointing_conversion import azel_to_xy_array
+    from visibility import VisibilityChecker
+
+INSIDE, OUTSIDE, BOUNDARY = 1, 0, -1
+# the corner margins must clear the x/y size of a cell by this factor, the cell edges are curves in x/y
+SAFETY = 1.5
+
+# layout of the float64 header at the front of the saved array, the polygon vertices follow it
+_MAGIC = 26.2023
+_HEADER = ('magic', 'version', 'step', 'n_az', 'n_el', 'x_min', 'x_max', 'y_min', 'y_max', 'n_vertices')
+_HEADER_SIZE = 16
+_VERSION = 1
+
+
+class ReachabilityMask():
+    """
+    Screen az/el points against a rectangular or polygon limit set with a precomputed grid.
+    """
+
+    def __init__(self, xy: Tuple[Tuple[float, float], Tuple[float, float]] = ((-86.0, 86.0), (-76.0, 76.0)),
+                 polygon: Optional[Sequence[Tuple[float, float]]] = None, step: float = 0.1, _data: np.ndarray = None):
+        """
+        Build the grid, or wrap a loaded array when _data is given.
+
+        Args: the rectangular x and y (min, max) limits, optional polygon vertices used instead of the rectangle,
+              the grid step in degrees.
+        """
+        if _data is None:
+            _data = self._build(xy, polygon, step)
+        header = _data[:_HEADER_SIZE * 8].view(np.double)
+        fields = dict(zip(_HEADER, header[:len(_HEADER)].tolist()))
+        if fields['magic'] != _MAGIC or int(fields['version']) != _VERSION:
+            raise ValueError("not a reachability mask array")
+        self.data = _data
+        self.step = fields['step']
+        self.n_az, self.n_el = int(fields['n_az']), int(fields['n_el'])
+        self.az_step = 360.0 / self.n_az
+        self.el_step = 90.0 / self.n_el
+        self.xy = ((fields['x_min'], fields['x_max']), (fields['y_min'], fields['y_max']))
+        n_vertices = int(fields['n_vertices'])
+        offset = _HEADER_SIZE * 8
+        self.polygon = None
+        if n_vertices:
+            self.polygon = [tuple(vertex) for vertex in _data[offset:offset + n_vertices * 16].view(np.double).reshape(-1, 2).tolist()]
+            offset += n_vertices * 16
+        self.checker = VisibilityChecker(self.xy, self.polygon, el_min=None)
+        # a zero copy view into the (possibly memory mapped) array
+        self.states = _data[offset:offset + self.n_az * self.n_el].reshape(self.n_az, self.n_el)
+
+    @classmethod
+    def _build(cls, xy: Tuple[Tuple[float, float], Tuple[float, float]], polygon: Optional[Sequence[Tuple[float, float]]],
+               step: float) -> np.ndarray:
+        if not (0.0 < step <= 10.0):
+            raise ValueError(f"the grid step must be in (0, 10] degrees, got {step}")
+        n_az = int(round(360.0 / step))
+        n_el = int(round(90.0 / step))
+        checker = VisibilityChecker(xy, polygon, el_min=None)
+        az, el = np.meshgrid(np.linspace(0.0, 360.0, n_az + 1), np.linspace(0.0, 90.0, n_el + 1), indexing='ij')
+        margin = checker.margin(az, el)
+        x, y = azel_to_xy_array(az, el)
+        # the x/y size of a cell, the longest of its edges and diagonals
+        corners = [(slice(None, -1), slice(None, -1)), (slice(1, None), slice(None, -1)),
+                   (slice(None, -1), slice(1, None)), (slice(1, None), slice(1, None))]
+        size = np.zeros((n_az, n_el))
+        for first in range(4):
+            for second in range(first + 1, 4):
+                a, b = corners[first], corners[second]
+                np.maximum(size, np.hypot(x[a] - x[b], y[a] - y[b]), out=size)
+        low = np.minimum.reduce([margin[corner] for corner in corners])
+        high = np.maximum.reduce([margin[corner] for corner in corners])
+        guard = SAFETY * size
+        states = np.full((n_az, n_el), BOUNDARY, dtype=np.int8)
+        states[low > guard] = INSIDE
+        states[high < -guard] = OUTSIDE
+        vertices = np.empty(0) if polygon is None else np.asarray(polygon, dtype=np.double).ravel()
+        header = np.zeros(_HEADER_SIZE)
+        (x_min, x_max), (y_min, y_max) = xy
+        header[:len(_HEADER)] = (_MAGIC, _VERSION, step, n_az, n_el, x_min, x_max, y_min, y_max, vertices.size // 2)
+        return np.concatenate((header.view(np.int8), vertices.view(np.int8), states.ravel()))
+
+    def lookup(self, az: np.ndarray, el: np.ndarray) -> np.ndarray:
+        """
+        The grid state of every point, BOUNDARY for points below the horizon or above the zenith.
+        """
+        az, el = np.broadcast_arrays(np.asarray(az, dtype=np.double), np.asarray(el, dtype=np.double))
+        i = np.minimum(((az % 360.0) / self.az_step).astype(np.intp), self.n_az - 1)
+        j = (el / self.el_step).astype(np.intp)
+        covered = (el >= 0.0) & (el <= 90.0)
+        # el == 90 belongs to the top cell
+        j = np.where(covered, np.minimum(j, self.n_el - 1), 0)
+        states = np.asarray(self.states.reshape(-1).take(i * self.n_el + j))
+        states[~covered] = BOUNDARY
+        return states
+
+    def contains(self, az: np.ndarray, el: np.ndarray) -> np.ndarray:
+        """
+        Test arrays of az, el points against the limits, the same answer as an exact limit margin >= 0.
+
+        Args: arrays of azimuth and elevation in degrees.
+
+        Returns: a boolean array, True for points inside or on the limits.
+        """
+        az, el = np.broadcast_arrays(np.asarray(az, dtype=np.double), np.asarray(el, dtype=np.double))
+        states = self.lookup(az, el)
+        inside = states == INSIDE
+        exact = np.flatnonzero(states.ravel() == BOUNDARY)
+        if exact.size:
+            inside.ravel()[exact] = self.checker.margin(az.ravel()[exact], el.ravel()[exact]) >= 0.0
+        return inside
+
+    def save(self, path: str):
+        """
+        Write the mask as a single .npy file that load can memory map.
+        """
+        np.save(path, np.asarray(self.data))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'ReachabilityMask':
+        """
+        Load a saved mask, memory mapped read only by default so processes share one copy.
+        """
+        return cls(_data=np.load(path, mmap_mode='r' if mmap else None))
+
+    @classmethod
+    def cached(cls, directory: str, xy: Tuple[Tuple[float, float], Tuple[float, float]] = ((-86.0, 86.0), (-76.0, 76.0)),
+               polygon: Optional[Sequence[Tuple[float, float]]] = None, step: float = 0.1) -> 'ReachabilityMask':
+        """
+        Load the mask for a limit set from a directory of saved masks, building and saving it on a miss.
+        """
+        geometry = np.asarray(xy if polygon is None else polygon, dtype=np.double).ravel()
+        digest = hashlib.sha1(f"{'limits' if polygon is None else 'polygon'}|{float(step)!r}|".encode())
+        digest.update(geometry.tobytes())
+        path = os.path.join(directory, f"mask-{digest.hexdigest()}.npy")
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            mask = cls(xy, polygon, step)
+            # save under a temporary name and rename so readers never see a partial file
+            temp_path = f"{path}.{os.getpid()}.tmp.npy"
+            mask.save(temp_path)
+            os.replace(temp_path, path)
+        return cls.load(path)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns: the grid step, the fraction of cells in each state and the size in bytes.
+        """
+        counts = {name: int(np.count_nonzero(self.states == state))
+                  for name, state in (('inside', INSIDE), ('outside', OUTSIDE), ('boundary', BOUNDARY))}
+        return {'step': self.step, 'nbytes': self.data.nbytes,
+                **{name: count / self.states.size for name, count in counts.items()}}
@@ -0,0 +1,141 @@
+"""
+X/Y axis rates and accelerations for time stamped az/el tracks.
+
+Near the x/y keyholes on the horizon (az 0 and 180, where the y axis points) a small az/el motion needs a large x rate,
+so a track that is easy for an az/el mount can be impossible for the 26M. Everything here works on whole arrays at once.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+try:
+    from .pointing_conversion import azel_to_xy_array
+except ImportError:
+    # run as a script or with src on sys.path
+    from pointing_conversion import azel_to_xy_array
+
+AXES = ('x', 'y')
+
+
+class Violation(NamedTuple):
+    """ One contiguous run of samples over an axis limit.
+    """
+    axis: str           # 'x' or 'y'
+    kind: str           # 'rate' or 'accel'
+    start: int          # first sample index in the run
+    stop: int           # last sample index in the run
+    start_time: float
+    stop_time: float
+    peak: float         # the largest absolute value in the run, deg/s or deg/s^2
+
+
+def xy_rates(t: np.ndarray, az: np.ndarray, el: np.ndarray, method: str = 'jacobian') -> Dict[str, np.ndarray]:
+    """
+    Compute the x/y positions, rates and accelerations along a track.
+
+    Args: arrays of time in seconds, azimuth and elevation in degrees,
+          "jacobian" maps the az/el rates through the analytic Jacobian, "gradient" differentiates x and y directly.
+
+    Returns: a dict of arrays, x, y in degrees, x_rate, y_rate in deg/s and x_accel, y_accel in deg/s^2.
+    """
+    t = np.asarray(t, dtype=np.double)
+    az = np.asarray(az, dtype=np.double)
+    el = np.asarray(el, dtype=np.double)
+    if not (t.shape == az.shape == el.shape) or t.ndim != 1:
+        raise ValueError("t, az and el must be 1-d arrays of the same length")
+    if t.size < 3:
+        raise ValueError("a track needs at least 3 samples")
+    x, y = azel_to_xy_array(az, el)
+    if method == 'gradient':
+        x_rate = np.gradient(x, t)
+        y_rate = np.gradient(y, t)
+    elif method == 'jacobian':
+        az_rate = np.gradient(np.unwrap(np.radians(az)), t)
+        el_rate = np.gradient(np.radians(el), t)
+        x_rate, y_rate = _jacobian_rates(np.radians(az), np.radians(el), az_rate, el_rate)
+    else:
+        raise ValueError(f"unknown rate method: {method}")
+    return {'x': x, 'y': y, 'x_rate': x_rate, 'y_rate': y_rate,
+            'x_accel': np.gradient(x_rate, t), 'y_accel': np.gradient(y_rate, t)}
+
+
+def _jacobian_rates(az: np.ndarray, el: np.ndarray, az_rate: np.ndarray, el_rate: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The x/y rates in deg/s from az/el in radians and their rates in rad/s.
+
+        x = atan2(E, U), y = asin(N) with E = sin(az)cos(el), N = cos(az)cos(el), U = sin(el)
+        dx = (U dE - E dU) / (E^2 + U^2),  dy = dN / sqrt(E^2 + U^2)
+    """
+    sin_az, cos_az = np.sin(az), np.cos(az)
+    sin_el, cos_el = np.sin(el), np.cos(el)
+    east = sin_az * cos_el
+    up = sin_el
+    d_east = cos_az * cos_el * az_rate - sin_az * sin_el * el_rate
+    d_up = cos_el * el_rate
+    d_north = -sin_az * cos_el * az_rate - cos_az * sin_el * el_rate
+    horizontal = east**2 + up**2
+    # at a keyhole the x rate has no finite value
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_rate = (up * d_east - east * d_up) / horizontal
+        y_rate = d_north / np.sqrt(horizontal)
+    return np.degrees(x_rate), np.degrees(y_rate)
+
+
+def find_violations(t: np.ndarray, rates: Dict[str, np.ndarray], max_rate: Tuple[float, float],
+                    max_accel: Optional[Tuple[float, float]] = None) -> List[Violation]:
+    """
+    Find the runs of samples where an axis rate or acceleration is over its limit.
+
+    Args: the track times, the xy_rates dict, the (x, y) rate limits in deg/s, optional (x, y) acceleration limits in deg/s^2.
+
+    Returns: the violations in time order.
+    """
+    t = np.asarray(t, dtype=np.double)
+    checks = [('rate', max_rate)]
+    if max_accel is not None:
+        checks.append(('accel', max_accel))
+    violations = []
+    for kind, limits in checks:
+        for axis, limit in zip(AXES, limits):
+            values = np.abs(rates[f"{axis}_{kind}"])
+            # a non finite rate (a keyhole pass) is always over the limit
+            over = ~(values <= limit)
+            for start, stop in _runs(over):
+                peak = values[start:stop + 1].max()
+                violations.append(Violation(axis, kind, int(start), int(stop), float(t[start]), float(t[stop]), float(peak)))
+    violations.sort(key=lambda violation: (violation.start, violation.axis, violation.kind))
+    return violations
+
+
+def _runs(mask: np.ndarray) -> Iterable[Tuple[int, int]]:
+    """
+    The (first, last) index of every run of True values.
+    """
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1)
+
+
+def analyze_track(t: np.ndarray, az: np.ndarray, el: np.ndarray, max_rate: Tuple[float, float],
+                  max_accel: Optional[Tuple[float, float]] = None, method: str = 'jacobian') -> Tuple[Dict[str, np.ndarray], List[Violation]]:
+    """
+    xy_rates followed by find_violations for one track.
+
+    Returns: the rates dict and the violations list.
+    """
+    rates = xy_rates(t, az, el, method)
+    return rates, find_violations(t, rates, max_rate, max_accel)
+
+
+def screen_tracks(tracks: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], max_rate: Tuple[float, float],
+                  max_accel: Optional[Tuple[float, float]] = None, method: str = 'jacobian') -> Dict[str, List[Violation]]:
+    """
+    Screen a schedule of passes against the axis limits.
+
+    Args: a dict of pass name to (t, az, el) arrays, the (x, y) rate limits in deg/s, optional (x, y) acceleration limits in deg/s^2.
+
+    Returns: a dict of pass name to its violations, passes with none are left out.
+    """
+    screened = {}
+    for name, (t, az, el) in tracks.items():
+        _, violations = analyze_track(t, az, el, max_rate, max_accel, method)
+        if violations:
+            screened[name] = violations
+    return screened
@@ -0,0 +1,235 @@
+"""
+Stream antenna command tracks between az/el and x/y in fixed size chunks.
+
+    python track_pipeline.py pass.csv pass_xy.csv --direction azel2xy --chunk-size 65536
+
+Input and output are CSV or Parquet, picked by the file extension. Only one chunk is held in memory at a time.
+"""
+from typing import Iterator, List, Optional, Sequence, Tuple
+import argparse
+import contextlib
+import csv
+import itertools
+import os
+import numpy as np
+try:
+    from .pointing_conversion import azel_to_xy_array, xy_to_azel_array
+except ImportError:
+    # run as a script or with src on sys.path
+    from pointing_conversion import azel_to_xy_array, xy_to_azel_array
+
+# direction: (input angle columns, output angle columns, conversion)
+DIRECTIONS = {
+    'azel2xy': (('az', 'el'), ('x', 'y'), azel_to_xy_array),
+    'xy2azel': (('x', 'y'), ('az', 'el'), xy_to_azel_array),
+}
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+Chunk = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def convert_chunk(first: np.ndarray, second: np.ndarray, direction: str = 'azel2xy') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert one chunk of angles.
+
+    Args: the first and second input angle arrays in degrees, either "azel2xy" or "xy2azel".
+
+    Returns: the two converted angle arrays in degrees.
+    """
+    try:
+        convert = DIRECTIONS[direction][2]
+    except KeyError:
+        raise ValueError(f"unknown conversion direction: {direction}") from None
+    return convert(first, second)
+
+
+def convert_track(input_path: str, output_path: str, direction: str = 'azel2xy', chunk_size: int = 65536,
+                  columns: Optional[Sequence[str]] = None, workers: int = 1) -> int:
+    """
+    Stream a track file through the conversion.
+
+    Args: the input and output file paths, either "azel2xy" or "xy2azel", the number of rows per chunk,
+          the input (time, angle, angle) column names, defaults to time plus az, el or x, y for the direction,
+          the number of processes each chunk is split across.
+
+    Returns: the number of rows converted.
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"unknown conversion direction: {direction}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    in_names, out_names, _ = DIRECTIONS[direction]
+    if columns is None:
+        columns = ('time',) + in_names
+    header = tuple(columns) + out_names
+    try:
+        return _convert(input_path, output_path, direction, chunk_size, columns, header, workers)
+    except BaseException:
+        # do not leave a truncated output file behind
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(output_path)
+        raise
+
+
+def _convert(input_path: str, output_path: str, direction: str, chunk_size: int, columns: Sequence[str],
+             header: Sequence[str], workers: int) -> int:
+    rows = 0
+    with contextlib.ExitStack() as stack:
+        convert = convert_chunk
+        if workers > 1:
+            try:
+                from .parallel_conversion import ParallelConverter
+            except ImportError:
+                # run as a script or with src on sys.path
+                from parallel_conversion import ParallelConverter
+            converter = stack.enter_context(ParallelConverter(workers, capacity=chunk_size, block_size=-(-chunk_size // workers)))
+            convert = converter.convert
+        writer = stack.enter_context(_open_writer(output_path, header))
+        for time, first, second in read_chunks(input_path, columns, chunk_size):
+            writer.write((time, first, second) + convert(first, second, direction))
+            rows += time.shape[0]
+    return rows
+
+
+def read_chunks(path: str, columns: Sequence[str], chunk_size: int) -> Iterator[Chunk]:
+    """
+    Read a track file in chunks.
+
+    Args: the file path, the (time, angle, angle) column names, the number of rows per chunk.
+
+    Returns: an iterator of (time, angle, angle) array tuples, the time column is passed through untouched.
+    """
+    if _is_parquet(path):
+        return _parquet_chunks(path, columns, chunk_size)
+    return _csv_chunks(path, columns, chunk_size)
+
+
+def _is_parquet(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in PARQUET_EXTENSIONS
+
+
+def _csv_chunks(path: str, columns: Sequence[str], chunk_size: int) -> Iterator[Chunk]:
+    with open(path, newline='') as csv_file:
+        reader = csv.reader(csv_file)
+        header = [name.strip() for name in next(reader)]
+        try:
+            index = [header.index(name) for name in columns]
+        except ValueError:
+            raise ValueError(f"{path} needs the columns {tuple(columns)}, found {tuple(header)}") from None
+        width = max(index) + 1
+
+        def data_rows() -> Iterator[List[str]]:
+            for row in reader:
+                # blank lines, such as a trailing one, are skipped
+                if not row:
+                    continue
+                if len(row) < width:
+                    raise ValueError(f"{path} line {reader.line_num} has {len(row)} columns, needs {width} for {tuple(columns)}")
+                yield row
+
+        rows = data_rows()
+        while True:
+            block = list(itertools.islice(rows, chunk_size))
+            if not block:
+                return
+            time, first, second = zip(*((row[index[0]], row[index[1]], row[index[2]]) for row in block))
+            yield np.array(time), np.array(first, dtype=np.double), np.array(second, dtype=np.double)
+
+
+def _parquet_chunks(path: str, columns: Sequence[str], chunk_size: int) -> Iterator[Chunk]:
+    pq = _import_parquet()
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=list(columns)):
+        time, first, second = (batch.column(name) for name in columns)
+        yield (time.to_numpy(zero_copy_only=False),
+               first.to_numpy(zero_copy_only=False).astype(np.double, copy=False),
+               second.to_numpy(zero_copy_only=False).astype(np.double, copy=False))
+
+
+def _import_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet tracks need the optional pyarrow package") from None
+    return pq
+
+
+class _CsvWriter():
+    """
+    Append chunks to a CSV file.
+    """
+
+    def __init__(self, path: str, header: Sequence[str]):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+
+    def write(self, columns: Sequence[np.ndarray]):
+        self.writer.writerows(zip(*(column.tolist() for column in columns)))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _ParquetWriter():
+    """
+    Append chunks to a Parquet file as row groups.
+    """
+
+    def __init__(self, path: str, header: Sequence[str]):
+        self.pq = _import_parquet()
+        self.path = path
+        self.header = list(header)
+        self.writer = None
+
+    def write(self, columns: Sequence[np.ndarray]):
+        import pyarrow as pa
+        table = pa.table(dict(zip(self.header, columns)))
+        if self.writer is None:
+            # the schema comes from the first chunk
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is None:
+            # an empty input still leaves a valid file behind
+            import pyarrow as pa
+            schema = pa.schema([(self.header[0], pa.string())] + [(name, pa.float64()) for name in self.header[1:]])
+            self.writer = self.pq.ParquetWriter(self.path, schema)
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_writer(path: str, header: Sequence[str]):
+    if _is_parquet(path):
+        return _ParquetWriter(path, header)
+    return _CsvWriter(path, header)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert antenna command tracks between az/el and x/y.")
+    parser.add_argument('input', help="input track file, .csv or .parquet")
+    parser.add_argument('output', help="output track file, .csv or .parquet")
+    parser.add_argument('--direction', choices=sorted(DIRECTIONS), default='azel2xy')
+    parser.add_argument('--chunk-size', type=int, default=65536, help="rows converted per chunk")
+    parser.add_argument('--columns', nargs=3, metavar=('TIME', 'FIRST', 'SECOND'), help="input column names")
+    parser.add_argument('--workers', type=int, default=1, help="processes each chunk is split across")
+    args = parser.parse_args(argv)
+    rows = convert_track(args.input, args.output, args.direction, args.chunk_size, args.columns, args.workers)
+    print(f"converted {rows} rows to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
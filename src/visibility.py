@@ -0,0 +1,103 @@
+"""
+Bulk visibility screening of satellite passes against the x/y mechanical limits.
+
+Every sample gets a signed limit margin in degrees, positive inside the limits, so limit crossings can be interpolated
+between samples where the margin changes sign.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+try:
+    from .limit_polygon import LimitPolygon
+    from .pointing_conversion import azel_to_xy_array
+except ImportError:
+    # run as a script or with src on sys.path
+    from limit_polygon import LimitPolygon
+    from pointing_conversion import azel_to_xy_array
+
+Track = Tuple[np.ndarray, np.ndarray, np.ndarray]
+Interval = Tuple[float, float]
+
+
+class VisibilityChecker():
+    """
+    Find the intervals of az/el tracks that the x/y antenna can follow.
+    """
+
+    def __init__(self, xy: Tuple[Tuple[float, float], Tuple[float, float]] = ((-86.0, 86.0), (-76.0, 76.0)),
+                 polygon: Optional[Sequence[Tuple[float, float]]] = None, el_min: Optional[float] = 0.0):
+        """
+        Args: the rectangular x and y (min, max) limits, optional polygon vertices used instead of the rectangle,
+              an optional elevation mask in degrees, None to rely on the x/y limits alone.
+        """
+        self.x, self.y = xy
+        self.polygon = None if polygon is None else LimitPolygon(polygon)
+        self.el_min = el_min
+
+    def margin(self, az: np.ndarray, el: np.ndarray) -> np.ndarray:
+        """
+        The signed distance in degrees from each az/el sample to the closest limit, positive inside.
+        """
+        az = np.asarray(az, dtype=np.double)
+        el = np.asarray(el, dtype=np.double)
+        x, y = azel_to_xy_array(az, el)
+        if self.polygon is None:
+            margin = np.minimum(np.minimum(x - self.x[0], self.x[1] - x), np.minimum(y - self.y[0], self.y[1] - y))
+        else:
+            inside, distance = self.polygon.contains(x, y)
+            margin = np.where(inside, distance, -distance)
+        if self.el_min is not None:
+            margin = np.minimum(margin, el - self.el_min)
+        return margin
+
+    def intervals(self, t: np.ndarray, az: np.ndarray, el: np.ndarray) -> List[Interval]:
+        """
+        The time intervals of one track that are inside the limits.
+
+        Args: arrays of time in seconds, azimuth and elevation in degrees.
+
+        Returns: a list of (start, stop) times, limit crossings are linearly interpolated between samples.
+        """
+        t = np.asarray(t, dtype=np.double)
+        return _intervals(t, self.margin(az, el))
+
+    def screen(self, tracks: Dict[str, Track]) -> Dict[str, List[Interval]]:
+        """
+        Screen many tracks with one conversion and one limit test over all of their samples.
+
+        Args: a dict of track name to (t, az, el) arrays.
+
+        Returns: a dict of track name to its list of (start, stop) visible intervals.
+        """
+        names = list(tracks)
+        if not names:
+            return {}
+        t, az, el = (np.concatenate([np.asarray(tracks[name][k], dtype=np.double).ravel() for name in names]) for k in range(3))
+        margin = self.margin(az, el)
+        bounds = np.cumsum([0] + [np.size(tracks[name][0]) for name in names])
+        return {name: _intervals(t[start:stop], margin[start:stop]) for name, start, stop in zip(names, bounds[:-1], bounds[1:])}
+
+
+def _intervals(t: np.ndarray, margin: np.ndarray) -> List[Interval]:
+    """
+    The (start, stop) times where margin >= 0, interpolating the zero crossings.
+    """
+    if t.size == 0:
+        return []
+    inside = margin >= 0.0
+    edges = np.diff(inside.view(np.int8))
+    # the crossing lies between sample i and i + 1
+    rises = np.flatnonzero(edges == 1)
+    sets = np.flatnonzero(edges == -1)
+    starts = _crossing(t, margin, rises).tolist()
+    stops = _crossing(t, margin, sets).tolist()
+    if inside[0]:
+        starts.insert(0, float(t[0]))
+    if inside[-1]:
+        stops.append(float(t[-1]))
+    return list(zip(starts, stops))
+
+
+def _crossing(t: np.ndarray, margin: np.ndarray, index: np.ndarray) -> np.ndarray:
+    m0 = margin[index]
+    m1 = margin[index + 1]
+    return t[index] + (t[index + 1] - t[index]) * m0 / (m0 - m1)
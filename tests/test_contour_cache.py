@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+from src.contour_cache import ContourCache
+
+LIMITS = ((-86.0, 86.0), (-76.0, 76.0))
+
+def test_memory_hits():
+    """Test a repeated configuration is served from memory."""
+    cache = ContourCache()
+    first = cache.contour(LIMITS)
+    second = cache.contour(LIMITS)
+    assert second is first
+    assert cache.stats() == {'hits': 1, 'disk_hits': 0, 'misses': 1, 'entries': 1}
+    assert first.shape == (360, 2)
+    assert not first.flags.writeable
+
+def test_put_without_copy():
+    """Test put holds a float64 array as is when asked not to copy."""
+    cache = ContourCache()
+    contour = np.asfortranarray(np.array([[0.0, 10.0], [1.0, 11.0]]))
+    held = cache.put('key', contour, copy=False)
+    assert np.shares_memory(held, contour)
+    assert not contour.flags.writeable
+    assert not np.shares_memory(cache.put('other', held), held)
+
+def test_key_parameters():
+    """Test every key parameter produces a distinct entry."""
+    cache = ContourCache()
+    cache.contour(LIMITS)
+    cache.contour(((-80.0, 86.0), (-76.0, 76.0)))
+    cache.contour(LIMITS, resolution=2.0)
+    cache.contour(LIMITS, tolerance=0.1)
+    cache.contour(LIMITS, mode="polygon")
+    cache.contour(LIMITS, mode="polygon", polygon=[(-50, -50), (50, -50), (50, 50), (-50, 50)])
+    assert cache.misses == 6
+    assert cache.hits == 0
+
+def test_polygon_key_ignores_limits():
+    """Test the polygon mode key does not depend on the rectangular limits."""
+    assert ContourCache.key(LIMITS, [(0, 0), (1, 0), (0, 1)], "polygon", 1.0, 0.05, "vectorized") == \
+        ContourCache.key(((-1.0, 1.0), (-1.0, 1.0)), [(0, 0), (1, 0), (0, 1)], "polygon", 1.0, 0.05, "vectorized")
+    with pytest.raises(ValueError):
+        ContourCache.key(LIMITS, None, "unknown", 1.0, 0.05, "vectorized")
+
+def test_lru_eviction():
+    """Test the least recently used contour is evicted first."""
+    cache = ContourCache(max_entries=2)
+    cache.contour(LIMITS, resolution=1.0)
+    cache.contour(LIMITS, resolution=2.0)
+    cache.contour(LIMITS, resolution=1.0)
+    cache.contour(LIMITS, resolution=3.0)
+    assert cache.stats()['entries'] == 2
+    cache.contour(LIMITS, resolution=1.0)
+    assert cache.hits == 2
+    cache.contour(LIMITS, resolution=2.0)
+    assert cache.misses == 4
+
+def test_disk_store(tmp_path):
+    """Test a contour written by one cache is read back by another."""
+    first = ContourCache(directory=str(tmp_path)).contour(LIMITS)
+    assert len(list(tmp_path.glob('*.npy'))) == 1
+    cache = ContourCache(directory=str(tmp_path))
+    second = cache.contour(LIMITS)
+    assert np.array_equal(first, second)
+    assert cache.stats() == {'hits': 0, 'disk_hits': 1, 'misses': 0, 'entries': 1}
+    cache.clear(disk=True)
+    assert list(tmp_path.glob('*.npy')) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+def test_threads():
+    """Test concurrent gets and puts on a small cache never fail and count every lookup."""
+    import sys
+    import threading
+    cache = ContourCache(max_entries=2)
+    contour = np.zeros((4, 2))
+    errors = []
+
+    def worker(seed):
+        try:
+            for i in range(2000):
+                key = str((seed + i) % 5)
+                if cache.get(key) is None:
+                    cache.put(key, contour)
+        except Exception as error:
+            errors.append(error)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert not errors
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 8000
+    assert stats['entries'] == 2
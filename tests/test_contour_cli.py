@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+from src.contour_cli import main
+from src.contour_export import CSV_BLOCK, contour_columns, write_contour
+from src.data_generator import DataGen
+
+def test_csv_output(tmp_path):
+    """Test the default contour written as CSV reads back as the vectorized contour."""
+    path = str(tmp_path / 'limits.csv')
+    assert main([path]) == 0
+    contour = np.loadtxt(path, delimiter=',', skiprows=1)
+    datagen = DataGen()
+    datagen.find_limits(method="vectorized")
+    assert np.array_equal(contour, np.array(datagen.limit_list))
+
+def test_polygon_npy_output(tmp_path):
+    """Test a polygon file, adaptive sampling and the binary output."""
+    polygon = tmp_path / 'polygon.csv'
+    polygon.write_text("x,y\n-60,-60\n60,-60\n60,60\n-60,60\n")
+    path = str(tmp_path / 'polygon.npy')
+    assert main([path, '--mode', 'polygon', '--polygon', str(polygon), '--resolution', '10', '--max-error', '0.2']) == 0
+    contour = np.load(path)
+    datagen = DataGen(polygon=[(-60, -60), (60, -60), (60, 60), (-60, 60)])
+    inside, close = datagen.test_polygon_azel(contour[:, 0], contour[:, 1])
+    assert inside.all() and close.all()
+    assert contour.shape[0] > 36
+
+def test_stdout_and_cache(tmp_path, capsys):
+    """Test CSV on stdout and the on disk cache."""
+    assert main(['-', '--resolution', '90', '--cache-dir', str(tmp_path)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == 'az,el' and len(lines) == 5
+    assert len(list(tmp_path.glob('*.npy'))) == 1
+
+def test_parquet_output(tmp_path):
+    """Test the Parquet exporter."""
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = str(tmp_path / 'limits.parquet')
+    write_contour(path, np.array([[0.0, 10.0], [1.0, 11.0]]))
+    table = pq.read_table(path)
+    assert table.column_names == ['az', 'el']
+    assert table.column('el').to_pylist() == [10.0, 11.0]
+
+def test_export_columns(tmp_path):
+    """Test the columns of a column major contour are not copied and CSV blocks read back exactly."""
+    rng = np.random.default_rng(22)
+    contour = np.asfortranarray(rng.uniform(0.0, 90.0, (CSV_BLOCK * 2 + 5, 2)))
+    columns = contour_columns(contour)
+    assert np.shares_memory(columns['az'], contour) and np.shares_memory(columns['el'], contour)
+    path = str(tmp_path / 'limits.csv')
+    write_contour(path, contour)
+    assert np.array_equal(np.loadtxt(path, delimiter=',', skiprows=1), contour)
+
+def test_single_precision(tmp_path):
+    """Test single precision writes float32 rows and the CSV keeps 9 digits."""
+    path = str(tmp_path / 'limits.npy')
+    assert main([path, '--precision', 'single']) == 0
+    contour = np.load(path)
+    assert contour.dtype == np.float32 and contour.shape == (360, 2)
+    csv_path = str(tmp_path / 'limits.csv')
+    write_contour(csv_path, contour)
+    assert np.array_equal(np.loadtxt(csv_path, delimiter=',', skiprows=1, dtype=np.float32), contour)
+    with pytest.raises(SystemExit):
+        main([path, '--precision', 'single', '--cache-dir', str(tmp_path)])
+
+def test_errors(tmp_path):
+    """Test argument errors exit and solver errors return 1."""
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'limits.txt')])
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'limits.csv'), '--mode', 'polygon', '--method', 'analytic'])
+    assert main([str(tmp_path / 'limits.csv'), '--resolution', '-1']) == 1
+
+def test_headless(tmp_path):
+    """Test generating a contour imports no GUI or plotting library."""
+    code = ("import sys; from src.contour_cli import main; main([sys.argv[1]]); "
+            "print([m for m in ('tkinter', 'matplotlib', 'polars') if m in sys.modules])")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code, str(tmp_path / 'limits.npy')], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+if __name__ == "__main__":
+    pytest.main([__file__])
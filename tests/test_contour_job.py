@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+from src.contour_job import ContourJob, diff_rows, format_rows
+from src.contour_cache import ContourCache
+
+def test_job_result():
+    """Test a job returns the same contour as the cache and reports full progress."""
+    cache = ContourCache()
+    job = ContourJob(ContourCache(), ((-86.0, 86.0), (-76.0, 76.0)), resolution=0.01).start()
+    assert job.wait(60.0)
+    assert job.error is None
+    assert job.progress == 1.0
+    assert job.result.shape == (36000, 2)
+    assert np.array_equal(job.result, cache.contour(((-86.0, 86.0), (-76.0, 76.0)), resolution=0.01))
+
+def test_job_cancel():
+    """Test a cancelled job finishes without a result or an error."""
+    cache = ContourCache()
+    job = ContourJob(cache, ((-86.0, 86.0), (-76.0, 76.0)), mode="polygon", resolution=0.01)
+    job.cancel()
+    job.start()
+    assert job.wait(60.0)
+    assert job.cancelled
+    assert job.result is None and job.error is None
+    assert cache.stats()['entries'] == 0
+
+def test_job_error():
+    """Test a failing job keeps the exception for the caller."""
+    job = ContourJob(ContourCache(), ((-86.0, 86.0), (-76.0, 76.0)), resolution=-1.0).start()
+    assert job.wait(60.0)
+    assert isinstance(job.error, ValueError)
+
+def test_diff_rows():
+    """Test the row diff only reports shown changes, appends and deletes."""
+    old = np.array([[0.0, 10.0], [1.0, 11.0], [2.0, 12.0]])
+    assert [a.tolist() if isinstance(a, np.ndarray) else a for a in diff_rows(None, old)] == [[], 3, 0]
+    new = np.array([[0.0, 10.0001], [1.0, 11.5], [2.0, 12.0], [3.0, 13.0], [4.0, 14.0]])
+    changed, appended, deleted = diff_rows(old, new)
+    assert changed.tolist() == [1] and appended == 2 and deleted == 0
+    changed, appended, deleted = diff_rows(new, old)
+    assert changed.tolist() == [1] and appended == 0 and deleted == 2
+    assert format_rows(new, [1, 3]) == [(1.0, 11.5), (3.0, 13.0)]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+import numpy as np
+from src.conversion_server import ConversionServer, ConversionClient
+from src.pointing_conversion import azel_to_xy_array
+
+async def with_server(body, **kwargs):
+    """Start a server on a free localhost port, run body(server, port) and shut down."""
+    server = ConversionServer(**kwargs)
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        return await body(server, port)
+    finally:
+        await server.close()
+
+def test_round_trip():
+    """Test both conversions and scalar requests over TCP."""
+    async def body(server, port):
+        client = await ConversionClient.connect(port=port)
+        az, el = [10.0, 90.0, 200.0], [20.0, 45.0, 60.0]
+        x, y = await client.request('azel2xy', az, el)
+        assert np.allclose((x, y), azel_to_xy_array(az, el))
+        back = await client.request('xy2azel', x, y)
+        assert np.allclose(back, (az, el))
+        scalar = await client.request('azel2xy', 90.0, 45.0)
+        assert np.allclose(scalar, (45.0, 0.0))
+        await client.close()
+    asyncio.run(with_server(body))
+
+def test_limit_check():
+    """Test the check op flags samples outside the x limit."""
+    async def body(server, port):
+        client = await ConversionClient.connect(port=port)
+        inside, margin = await client.request('check', [90.0, 90.0], [10.0, 2.0])
+        assert inside == [True, False]
+        assert margin[0] > 0.0 > margin[1]
+        await client.close()
+    asyncio.run(with_server(body))
+
+def test_errors():
+    """Test bad requests get an error response and do not break the connection."""
+    async def body(server, port):
+        client = await ConversionClient.connect(port=port)
+        with pytest.raises(RuntimeError):
+            await client.request('unknown', [1.0], [1.0])
+        with pytest.raises(RuntimeError):
+            await client.request('azel2xy', [1.0, 2.0], [1.0])
+        assert np.allclose(await client.request('xy2azel', 45.0, 0.0), (90.0, 45.0))
+        await client.close()
+    asyncio.run(with_server(body))
+
+def test_large_request():
+    """Test a request line over 64 KiB converts, and one over the line limit fails every waiting request."""
+    async def body(server, port):
+        client = await ConversionClient.connect(port=port)
+        rng = np.random.default_rng(15)
+        az, el = rng.uniform(0.0, 360.0, 10000).tolist(), rng.uniform(0.0, 90.0, 10000).tolist()
+        x, y = await client.request('azel2xy', az, el)
+        assert np.allclose((x, y), azel_to_xy_array(az, el))
+        await client.close()
+        small = ConversionServer(max_batch=100)
+        listener = await small.start('127.0.0.1', 0)
+        client = await ConversionClient.connect(port=listener.sockets[0].getsockname()[1])
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(asyncio.gather(client.request('azel2xy', az, el), client.request('azel2xy', 1.0, 1.0)), 10.0)
+        await client.close()
+        await small.close()
+    asyncio.run(with_server(body))
+
+def test_batching():
+    """Test concurrent requests from several clients are coalesced."""
+    async def body(server, port):
+        clients = [await ConversionClient.connect(port=port) for _ in range(4)]
+        rng = np.random.default_rng(14)
+        az, el = rng.uniform(0.0, 360.0, (4, 50)), rng.uniform(0.0, 90.0, (4, 50))
+        results = await asyncio.gather(*(clients[i].request('azel2xy', [az[i, j]], [el[i, j]])
+                                         for i in range(4) for j in range(50)))
+        expected = np.stack(azel_to_xy_array(az, el), axis=-1).reshape(-1, 2)
+        assert np.allclose(np.array(results).reshape(-1, 2), expected)
+        assert server.requests == 200
+        assert server.batches < 50
+        for client in clients:
+            await client.close()
+    asyncio.run(with_server(body, window=0.01))
+
+def test_unix_socket(tmp_path):
+    """Test the Unix socket listener."""
+    async def body():
+        server = ConversionServer()
+        path = str(tmp_path / 'xy.sock')
+        await server.start_unix(path)
+        client = await ConversionClient.connect(path=path)
+        assert np.allclose(await client.request('azel2xy', 90.0, 45.0), (45.0, 0.0))
+        await client.close()
+        await server.close()
+    asyncio.run(body())
+
+if __name__ == "__main__":
+    pytest.main([__file__])
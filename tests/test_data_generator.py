@@ -0,0 +1,228 @@
+import pytest
+import numpy as np
+from src.data_generator import DataGen
+from src.pointing_conversion import FLOAT32_ERROR, azel_to_xy_array
+from src.visibility import VisibilityChecker
+
+@pytest.fixture
+def datagen():
+    """Fixture to create a DataGen object with the legacy 26M limits."""
+    return DataGen()
+
+def test_find_limits(datagen):
+    """Test the recursive limit contour covers every degree of azimuth."""
+    datagen.find_limits()
+    assert len(datagen.limit_list) == 360
+    for az, el in datagen.limit_list:
+        assert 0.0 < el < 90.0
+        datagen.enu.from_azel(az, el)
+        assert datagen.test_limits(datagen.enu.xy) == (True, True)
+
+def test_contour_columns(datagen):
+    """Test the contour array is column major and limit_list is built from it."""
+    datagen.find_limits(method="vectorized")
+    assert datagen.contour.shape == (360, 2)
+    assert datagen.contour[:, 0].flags.c_contiguous and datagen.contour[:, 1].flags.c_contiguous
+    assert datagen.limit_list == [tuple(row) for row in datagen.contour.tolist()]
+
+@pytest.mark.parametrize("mode", ["limits", "polygon"])
+def test_float32_contour(datagen, mode):
+    """Test a float32 contour is within the tolerance band of a limit edge, widened by FLOAT32_ERROR, in float64."""
+    datagen.dtype = np.float32
+    if mode == "limits":
+        datagen.find_limits(0.1, "vectorized")
+    else:
+        datagen.find_from_point(0.1, "vectorized")
+    assert datagen.contour.dtype == np.float32
+    checker = VisibilityChecker(polygon=None if mode == "limits" else datagen.legacy_lims, el_min=None)
+    margin = checker.margin(datagen.contour[:, 0].astype(np.double), datagen.contour[:, 1].astype(np.double))
+    assert margin.min() >= -FLOAT32_ERROR
+    assert margin.max() <= datagen.tolerance + FLOAT32_ERROR
+
+def test_find_limits_vectorized(datagen):
+    """Test the vectorized bisection matches the recursive bisection."""
+    datagen.find_limits()
+    recursive = np.array(datagen.limit_list)
+    datagen.find_limits(method="vectorized")
+    vectorized = np.array(datagen.limit_list)
+    assert recursive.shape == vectorized.shape
+    assert np.allclose(recursive, vectorized)
+
+def test_find_limits_resolution(datagen):
+    """Test sub-degree azimuth resolution."""
+    datagen.find_limits(resolution=0.1, method="vectorized")
+    azimuths = np.array(datagen.limit_list)[:, 0]
+    assert azimuths.size == 3600
+    assert np.allclose(np.diff(azimuths), 0.1)
+
+@pytest.mark.parametrize("xy", [((-86.0, 86.0), (-76.0, 76.0)), ((-60.0, 80.0), (-30.0, 70.0)), ((-89.9, 89.9), (-89.0, 89.0))])
+def test_find_limits_analytic(xy):
+    """Test the analytic contour sits on a limit edge and just below the bisected contour."""
+    datagen = DataGen(xy)
+    datagen.find_limits(resolution=0.5, method="analytic")
+    analytic = np.array(datagen.limit_list)
+    x, y = azel_to_xy_array(analytic[:, 0], analytic[:, 1])
+    edge = np.min(np.abs(np.stack([x - xy[0][0], x - xy[0][1], y - xy[1][0], y - xy[1][1]])), axis=0)
+    assert np.allclose(edge, 0.0, atol=1e-9)
+    datagen.find_limits(resolution=0.5, method="vectorized")
+    bisected = np.array(datagen.limit_list)
+    assert np.all(bisected[:, 1] > analytic[:, 1] - 1e-3)
+    assert np.all(bisected[:, 1] - analytic[:, 1] < 0.5)
+
+def test_find_limits_analytic_needs_zenith():
+    """Test limits that exclude the zenith are rejected by the analytic solver."""
+    datagen = DataGen(((10.0, 86.0), (-76.0, 76.0)))
+    with pytest.raises(ValueError):
+        datagen.find_limits(method="analytic")
+
+def test_find_from_point_vectorized(datagen):
+    """Test the vectorized polygon bisection against the recursive one."""
+    datagen.find_from_point()
+    recursive = np.array(datagen.limit_list)
+    datagen.find_from_point(method="vectorized")
+    vectorized = np.array(datagen.limit_list)
+    assert recursive.shape == vectorized.shape
+    assert np.allclose(recursive[:, 0], vectorized[:, 0])
+    assert np.all(np.abs(recursive[:, 1] - vectorized[:, 1]) < 0.5)
+
+@pytest.mark.parametrize("method", ["recursive", "vectorized"])
+def test_find_limits_warm_start(method):
+    """Test a warm started contour after nudging one limit is a valid contour and keeps the unaffected azimuths."""
+    previous = DataGen()
+    previous.find_limits(method="vectorized")
+    datagen = DataGen(((-80.0, 86.0), (-76.0, 76.0)))
+    datagen.find_limits(method=method, previous=previous.limit_list)
+    contour = np.array(datagen.limit_list)
+    inside, close = datagen.test_limits_azel(contour[:, 0], contour[:, 1])
+    assert inside.all() and close.all()
+    assert 0 < datagen.warm_stats['recomputed'] < datagen.warm_stats['kept']
+    # the other side of the sky did not change
+    east = contour[:, 0] < 180.0
+    assert np.array_equal(contour[east], np.array(previous.limit_list)[east])
+
+def test_find_from_point_warm_start(datagen):
+    """Test a polygon contour warm started from a contour at a different resolution."""
+    datagen.find_from_point(resolution=2.0, method="vectorized")
+    previous = datagen.limit_list
+    datagen.legacy_lims = [(x * 0.95, y) for x, y in datagen.legacy_lims]
+    datagen.find_from_point(method="vectorized", previous=previous)
+    contour = np.array(datagen.limit_list)
+    assert contour.shape == (360, 2)
+    inside, close = datagen.test_polygon_azel(contour[:, 0], contour[:, 1])
+    assert inside.all() and close.all()
+
+def test_find_limits_adaptive(datagen):
+    """Test adaptive sampling meets the elevation error with far fewer samples than a fine uniform grid."""
+    datagen.find_limits(resolution=0.01, method="analytic")
+    fine = np.array(datagen.limit_list)
+    datagen.find_limits(resolution=5.0, method="analytic", max_error=0.05)
+    adaptive = np.array(datagen.limit_list)
+    assert adaptive.shape[0] < fine.shape[0] / 50
+    assert np.all(np.diff(adaptive[:, 0]) > 0.0)
+    assert np.abs(np.interp(fine[:, 0], adaptive[:, 0], adaptive[:, 1], period=360.0) - fine[:, 1]).max() < 0.05
+    # the corners where the binding edge changes are sampled densely
+    steps = np.diff(adaptive[:, 0])
+    assert steps.min() <= 2 * datagen.min_step < 1.0 < steps.max()
+
+def test_find_from_point_adaptive(datagen):
+    """Test an adaptive polygon contour is valid at every sample."""
+    datagen.find_from_point(resolution=5.0, method="vectorized", max_error=0.2)
+    contour = np.array(datagen.limit_list)
+    assert 72 < contour.shape[0] < 720
+    inside, close = datagen.test_polygon_azel(contour[:, 0], contour[:, 1])
+    assert inside.all() and close.all()
+    with pytest.raises(ValueError):
+        datagen.find_from_point(method="vectorized", max_error=0.0)
+
+def test_search_stats(datagen):
+    """Test the per azimuth search stats agree between the one at a time and the array solvers."""
+    datagen.find_limits(method="recursive")
+    recursive = datagen.search_stats
+    assert recursive['iterations'].shape == (360,)
+    assert recursive['converged'].all()
+    assert np.array_equal(recursive['evaluations'], recursive['iterations'])
+    datagen.find_limits(method="vectorized")
+    assert np.array_equal(datagen.search_stats['iterations'], recursive['iterations'])
+    assert np.allclose(datagen.search_stats['bracket'], recursive['bracket'])
+
+@pytest.mark.parametrize("mode", ["limits", "polygon"])
+def test_accelerated_search(datagen, mode):
+    """Test the secant accelerated search finds valid points in fewer steps."""
+    find = datagen.find_limits if mode == "limits" else datagen.find_from_point
+    classify = datagen.test_limits_azel if mode == "limits" else datagen.test_polygon_azel
+    find(method="recursive")
+    plain = datagen.search_stats['iterations'].mean()
+    datagen.accelerate = True
+    find(method="recursive")
+    contour = np.array(datagen.limit_list)
+    inside, close = classify(contour[:, 0], contour[:, 1])
+    assert inside.all() and close.all()
+    assert datagen.search_stats['iterations'].mean() < 0.8 * plain
+
+def test_search_failure(datagen):
+    """Test running out of iterations is reported and an empty bracket raises."""
+    datagen.max_iter = 3
+    datagen.find_limits(method="recursive")
+    stats = datagen.search_stats
+    assert not stats['converged'].all()
+    assert stats['iterations'].max() == 3
+    contour = np.array(datagen.limit_list)
+    failed = ~stats['converged']
+    # the fallback is the lowest elevation known to be inside
+    assert datagen.test_limits_azel(contour[failed, 0], contour[failed, 1])[0].all()
+    assert np.all(stats['bracket'][failed] > 5.0)
+    with pytest.raises(ValueError):
+        datagen.recursive_find_el(10.0, 50.0, 40.0)
+    with pytest.raises(ValueError):
+        datagen.recursive_point_resolve(10.0, 50.0, 40.0)
+
+def test_no_inside_probe():
+    """Test an azimuth the limits never reach gives NaN rather than the untested bracket top, and strict raises."""
+    datagen = DataGen(((10.0, 86.0), (-76.0, 76.0)))
+    result = datagen._search(270.0, 1e-9, 89.99, datagen._limit_probe)
+    assert np.isnan(result.elevation) and not result.converged
+    assert np.isnan(datagen.recursive_find_el(270.0, 1e-9, 89.99))
+    with pytest.raises(ValueError):
+        datagen.recursive_find_el(270.0, 1e-9, 89.99, strict=True)
+    assert 0.0 < datagen.recursive_find_el(90.0, 1e-9, 89.99, strict=True) < 90.0
+    elevations = datagen.vector_find_el(np.array([90.0, 270.0]), 1e-9, 89.99)
+    assert 0.0 < elevations[0] < 90.0 and np.isnan(elevations[1])
+    datagen.legacy_lims = [(10, -60), (60, -60), (60, 60), (10, 60)]
+    assert np.isnan(datagen.recursive_point_resolve(270.0, 1e-9, 89.99))
+    assert np.isnan(datagen.vector_point_resolve(np.array([270.0]), 1e-9, 89.99)[0])
+
+def test_progress_callback(datagen):
+    """Test progress is reported per block and an exception from the callback abandons the search."""
+    reports = []
+    datagen.progress = lambda done, total: reports.append((done, total))
+    datagen.find_limits(resolution=0.05, method="vectorized")
+    assert reports[-1] == (7200, 7200)
+    assert len(reports) == -(-7200 // datagen.PROGRESS_BLOCK)
+    datagen.progress = lambda done, total: 1 / 0
+    with pytest.raises(ZeroDivisionError):
+        datagen.find_limits(resolution=0.05, method="recursive")
+
+def test_set_polygon(datagen):
+    """Test setting a new polygon rebuilds the edge data."""
+    datagen.legacy_lims = [(-50, -50), (50, -50), (50, 50), (-50, 50)]
+    assert len(datagen.polygon) == 4
+    assert datagen.point_in_polygon((60, 0)) == (False, None)
+    inside, distance = datagen.points_in_polygon(np.array([0.0, 49.0]), np.array([0.0, 0.0]))
+    assert list(inside) == [True, True]
+    assert np.allclose(distance, [50.0, 1.0])
+
+def test_find_limits_bad_method(datagen):
+    """Test an unknown solver method is rejected."""
+    with pytest.raises(ValueError):
+        datagen.find_limits(method="unknown")
+
+def test_test_limits_array(datagen):
+    """Test the array limit check against the scalar limit check."""
+    x = np.array([0.0, 85.98, 90.0, -86.0, 10.0])
+    y = np.array([0.0, 10.0, 0.0, 10.0, 75.97])
+    inside, close = datagen.test_limits_array(x, y)
+    for i in range(x.size):
+        assert (inside[i], close[i]) == datagen.test_limits((x[i], y[i]))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+from src.instrumentation import Instrumentation
+from src.data_generator import DataGen
+from src.pointing_conversion import ENU, ENUBatch
+
+def test_counts_match_search_stats():
+    """Test the limit test count matches the ENU evaluations the search reports."""
+    datagen = DataGen()
+    with Instrumentation() as probe:
+        datagen.find_limits(method="recursive")
+    summary = probe.summary()
+    evaluations = int(datagen.search_stats['evaluations'].sum())
+    assert summary['DataGen.test_limits']['calls'] == evaluations
+    assert summary['ENU.from_azel']['calls'] == evaluations
+    assert summary['ENU.from_azel']['seconds'] > 0.0
+    assert 'ENU.R_rpy' not in summary
+    assert 'DataGen.test_limits' in probe.report()
+
+def test_disable_restores_originals():
+    """Test disabling puts the exact original functions back, classmethods included."""
+    originals = {name: ENU.__dict__[name] for name in ('R_east', 'from_azel', 'update_state')}
+    batch_from_azel = ENUBatch.__dict__['from_azel']
+    probe = Instrumentation()
+    probe.enable()
+    try:
+        assert ENU.__dict__['R_east'] is not originals['R_east']
+        batch = ENUBatch.from_azel(np.array([90.0]), np.array([45.0]))
+        assert np.allclose(batch.x, 45.0)
+    finally:
+        probe.disable()
+    for name, original in originals.items():
+        assert ENU.__dict__[name] is original
+    assert ENUBatch.__dict__['from_azel'] is batch_from_azel
+    assert probe.summary()['ENUBatch.from_azel']['calls'] == 1
+    # nothing counts once disabled
+    ENU(azel=(10.0, 20.0))
+    assert 'ENU.from_azel' not in probe.summary()
+
+def test_callback_and_single_active():
+    """Test the callback gets the summary and two instrumentations can not be enabled together."""
+    reports = []
+    probe = Instrumentation(callback=reports.append)
+    with probe:
+        ENU(xy=(10.0, 20.0)).R_rpy(1.0, 2.0, 3.0)
+        with pytest.raises(RuntimeError):
+            Instrumentation().enable()
+    assert reports[0]['ENU.from_xy']['calls'] == 1
+    assert reports[0]['ENU.R_rpy']['calls'] == 1
+    probe.reset()
+    assert probe.summary() == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+from src.limit_polygon import LimitPolygon
+
+LEGACY = [(86, 61), (77, 61), (77, 71), (57, 71), (57, 74), (-57, 74), (-57, 71), (-77, 71), (-77, 61), (-86, 61), (-86, -64), (-71, -64), (-71, -71), (71, -71), (71, -64), (86, -64)]
+
+@pytest.fixture
+def polygon():
+    """Fixture to create the legacy 26M limit polygon."""
+    return LimitPolygon(LEGACY)
+
+@pytest.fixture
+def points():
+    """Fixture with random x,y points around the polygon."""
+    rng = np.random.default_rng(26)
+    return rng.uniform(-95.0, 95.0, 2000), rng.uniform(-95.0, 95.0, 2000)
+
+def test_too_few_vertices():
+    """Test a polygon needs at least three vertices."""
+    with pytest.raises(ValueError):
+        LimitPolygon([(0, 0), (1, 1)])
+    with pytest.raises(ValueError):
+        LimitPolygon([(0, 0), (1, 1), (1, 1), (0, 0)])
+
+def test_closed_ring(polygon, points):
+    """Test a closing vertex equal to the first, and repeated vertices, give the same answers as the open ring."""
+    closed = LimitPolygon(LEGACY[:3] + [LEGACY[2]] + LEGACY[3:] + [LEGACY[0]])
+    assert len(closed) == len(LEGACY)
+    inside, distance = closed.contains(*points)
+    expected_inside, expected_distance = polygon.contains(*points)
+    assert np.array_equal(inside, expected_inside)
+    assert np.array_equal(distance, expected_distance)
+    assert closed.point_in_polygon((0, 0)) == polygon.point_in_polygon((0, 0))
+
+@pytest.mark.parametrize("point,inside", [((0, 0), True), ((80, 60), True), ((80, 65), False), ((0, 73), True), ((0, 75), False), ((90, 0), False), ((-80, -70), False)])
+def test_point_in_polygon(polygon, point, inside):
+    """Test the scalar polygon check with known points."""
+    assert polygon.point_in_polygon(point)[0] == inside
+
+def test_point_on_edge(polygon):
+    """Test a point on an edge is inside with no distance."""
+    assert polygon.point_in_polygon((0, 74)) == (True, 0)
+
+def test_contains_matches_scalar(polygon, points):
+    """Test the batch inside flags match the scalar ray casting."""
+    x, y = points
+    inside, distance = polygon.contains(x, y)
+    assert inside.shape == x.shape
+    for i in range(x.size):
+        assert inside[i] == polygon.point_in_polygon((x[i], y[i]))[0]
+
+def test_contains_segment_distance(polygon, points):
+    """Test the batch distances are to the closest edge segment, not the edge line."""
+    x, y = points
+    _, distance = polygon.contains(x, y)
+    # brute force the distance to densely sampled edges
+    t = np.linspace(0.0, 1.0, 2001)[:, None]
+    edge_points = (polygon.vertices + t[..., None] * (np.roll(polygon.vertices, -1, axis=0) - polygon.vertices)).reshape(-1, 2)
+    for i in range(0, x.size, 50):
+        brute = np.hypot(edge_points[:, 0] - x[i], edge_points[:, 1] - y[i]).min()
+        assert distance[i] <= brute + 1e-9
+        assert brute - distance[i] < 0.05
+    # a point beyond the end of the (57, 74)-(-57, 74) segment is not close to it
+    _, distance = polygon.contains(np.array([0.0, 100.0]), np.array([74.0, 74.0]))
+    assert distance[0] == 0.0
+    assert distance[1] > 10.0
+
+def test_contains_chunking(points):
+    """Test small blocks give the same answer as one block."""
+    x, y = points
+    inside, distance = LimitPolygon(LEGACY).contains(x, y)
+    inside_small, distance_small = LimitPolygon(LEGACY, chunk_size=7).contains(x, y)
+    assert np.array_equal(inside, inside_small)
+    assert np.allclose(distance, distance_small)
+
+def test_nearest_edge(polygon):
+    """Test the nearest edge index matches the contains distance."""
+    assert polygon.nearest_edge(np.array([0.0, 86.5, 0.0]), np.array([73.0, 0.0, -70.0])).tolist() == [4, 15, 12]
+    x, y = np.random.default_rng(16).uniform(-90.0, 90.0, (2, 500))
+    edge = LimitPolygon(LEGACY, chunk_size=7).nearest_edge(x, y)
+    _, distance = polygon.contains(x, y)
+    assert np.allclose(polygon._segment_distance(x[:, None], y[:, None])[np.arange(x.size), edge], distance)
+
+def test_contains_float32(polygon, points):
+    """Test float32 points are tested in float32 and agree away from the edges."""
+    x, y = points
+    inside, distance = polygon.contains(x, y)
+    inside32, distance32 = polygon.contains(x.astype(np.float32), y.astype(np.float32))
+    assert distance32.dtype == np.float32
+    assert np.abs(distance32 - distance).max() < 1e-4
+    assert np.array_equal(inside32[distance > 1e-3], inside[distance > 1e-3])
+
+if __name__ == "__main__":
+    pytest.main([__file__])
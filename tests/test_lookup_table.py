@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from src.lookup_table import LookupTable
+from src.pointing_conversion import azel_to_xy_array, xy_to_azel_array
+
+@pytest.fixture(scope="module")
+def table():
+    """Fixture with a coarse table to keep the build quick."""
+    return LookupTable(step=1.0, el_min=5.0)
+
+@pytest.fixture
+def azel():
+    rng = np.random.default_rng(11)
+    return rng.uniform(0.0, 360.0, 20000), rng.uniform(5.0, 90.0, 20000)
+
+@pytest.mark.parametrize("method", ["bilinear", "bicubic"])
+def test_azel_to_xy_error_bound(table, azel, method):
+    """Test random queries stay inside the measured error bound."""
+    az, el = azel
+    x, y = table.azel_to_xy(az, el, method)
+    exact_x, exact_y = azel_to_xy_array(az, el)
+    bound = table.error_bound[('azel2xy', method)]
+    assert 0.0 < bound < 0.5
+    assert np.abs(x - exact_x).max() <= bound
+    assert np.abs(y - exact_y).max() <= bound
+
+@pytest.mark.parametrize("method", ["bilinear", "bicubic"])
+def test_xy_to_azel_error_bound(table, method):
+    """Test random queries away from the zenith stay inside the measured error bound."""
+    rng = np.random.default_rng(12)
+    x, y = rng.uniform(-90.0, 90.0, 20000), rng.uniform(-90.0, 90.0, 20000)
+    az, el = table.xy_to_azel(x, y, method)
+    exact_az, exact_el = xy_to_azel_array(x, y)
+    bound = table.error_bound[('xy2azel', method)]
+    az_error = np.abs((az - exact_az + 180.0) % 360.0 - 180.0) * np.cos(np.radians(exact_el))
+    assert az_error.max() <= bound
+    assert np.abs(el - exact_el).max() <= bound
+
+def test_bicubic_beats_bilinear(table):
+    """Test the higher order interpolation is more accurate away from the keyholes."""
+    assert table.error_bound[('xy2azel', 'bicubic')] < table.error_bound[('xy2azel', 'bilinear')]
+    assert table.error_bound[('azel2xy', 'bicubic')] < table.error_bound[('azel2xy', 'bilinear')]
+
+def test_wrap_and_fallback(table):
+    """Test azimuths wrap and elevations below the grid use the closed form."""
+    x, y = table.azel_to_xy(np.array([-10.0, 350.0, 370.0, 10.0, 45.0]), np.array([30.0, 30.0, 30.0, 30.0, 1.0]))
+    assert np.isclose(x[0], x[1])
+    assert np.isclose(x[2], x[3])
+    assert np.allclose((x[4], y[4]), azel_to_xy_array(45.0, 1.0))
+
+def test_unknown_method(table):
+    with pytest.raises(ValueError):
+        table.azel_to_xy(10.0, 10.0, 'nearest')
+
+def test_bad_parameters():
+    with pytest.raises(ValueError):
+        LookupTable(step=0.0)
+    with pytest.raises(ValueError):
+        LookupTable(el_min=90.0)
+
+def test_save_load_mmap(table, azel, tmp_path):
+    """Test a saved table memory maps back with the same answers."""
+    path = tmp_path / 'table.npy'
+    table.save(str(path))
+    loaded = LookupTable.load(str(path))
+    assert isinstance(loaded.data, np.memmap)
+    assert loaded.error_bound == table.error_bound
+    az, el = azel
+    assert np.array_equal(loaded.azel_to_xy(az, el), table.azel_to_xy(az, el))
+    with pytest.raises(ValueError):
+        np.save(str(path), np.zeros(32))
+        LookupTable.load(str(path))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+from src.mount_model import MountModel
+from src.pointing_conversion import ENU, azel_to_xy_array
+
+@pytest.fixture
+def pointings():
+    """Fixture with random az, el pointings away from the zenith and horizon."""
+    rng = np.random.default_rng(21)
+    return rng.uniform(0.0, 360.0, 500), rng.uniform(5.0, 85.0, 500)
+
+def test_matches_enu_rotations(pointings):
+    """Test every model rotation matches the ENU method it mirrors."""
+    az, el = pointings
+    for model, rotate in [(MountModel.rpy(0.3, -0.2, 0.5), lambda enu: enu.R_rpy(0.3, -0.2, 0.5)),
+                          (MountModel.east(0.4), lambda enu: enu.R_east(0.4)),
+                          (MountModel.north(-0.7), lambda enu: enu.R_north(-0.7)),
+                          (MountModel.up(1.1), lambda enu: enu.R_up(1.1))]:
+        corrected = model.correct(az[:20], el[:20])
+        for i in range(20):
+            enu = ENU(azel=(az[i], el[i]))
+            rotate(enu)
+            enu.update_state()
+            assert np.allclose((corrected[0][i], corrected[1][i]), enu.azel)
+
+def test_chain_and_inverse(pointings):
+    """Test a chain equals the corrections one after another and the inverse undoes it."""
+    az, el = pointings
+    tilt = MountModel.rpy(0.05, -0.02, 0.0)
+    misalignment = MountModel.up(0.1).then(MountModel.east(-0.03))
+    model = MountModel.chain(tilt, misalignment)
+    step = tilt.correct(az, el)
+    step = misalignment.correct(*step)
+    assert np.allclose(model.correct(az, el), step)
+    back = model.inverse().correct(*model.correct(az, el))
+    assert np.allclose(back, (az, el))
+    assert np.allclose(MountModel().correct(az, el), (az, el))
+    with pytest.raises(ValueError):
+        model.matrix[0, 0] = 2.0
+
+def test_frames(pointings):
+    """Test az/el and x/y inputs and outputs agree with the closed form conversions."""
+    az, el = pointings
+    model = MountModel.rpy(0.2, 0.1, -0.3)
+    corrected_az, corrected_el = model.correct(az, el)
+    x, y = model.correct(az, el, output='xy')
+    assert np.allclose((x, y), azel_to_xy_array(corrected_az, corrected_el))
+    from_xy = model.correct(*azel_to_xy_array(az, el), frame='xy', output='azel')
+    assert np.allclose(from_xy, (corrected_az, corrected_el))
+    assert np.allclose(model.apply(np.array([[0.0, 1.0, 0.0]])), np.array([[0.0, 1.0, 0.0]]) @ model.matrix)
+    with pytest.raises(ValueError):
+        model.correct(az, el, frame='radec')
+    with pytest.raises(ValueError):
+        MountModel(np.eye(2))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from src.offset_axis import OffsetAxisModel, Y_OFFSET
+from src.pointing_conversion import azel_to_xy_array, xy_to_azel_array
+
+@pytest.fixture
+def targets():
+    """Fixture with random near field targets, az, el and range in meters."""
+    rng = np.random.default_rng(25)
+    return rng.uniform(0.0, 360.0, 5000), rng.uniform(0.0, 90.0, 5000), rng.uniform(30.0, 5000.0, 5000)
+
+def test_zero_offset(targets):
+    """Test a zero offset model matches the closed form conversions at any range."""
+    az, el, rng = targets
+    model = OffsetAxisModel(0.0)
+    assert np.allclose(model.azel_to_xy(az, el, rng), azel_to_xy_array(az, el))
+    x, y = azel_to_xy_array(az, el)
+    assert np.allclose(model.xy_to_azel(x, y, rng), xy_to_azel_array(x, y))
+
+def test_boresight_geometry(targets):
+    """Test the target lies on the boresight leaving the offset Y axis, and x is unchanged."""
+    az, el, rng = targets
+    x, y = OffsetAxisModel().azel_to_xy(az, el, rng)
+    x_rad, y_rad, az_rad, el_rad = np.radians((x, y, az, el))
+    axis = Y_OFFSET * np.stack((np.sin(x_rad), np.zeros_like(x_rad), np.cos(x_rad)), axis=-1)
+    boresight = np.stack((np.sin(x_rad) * np.cos(y_rad), np.sin(y_rad), np.cos(x_rad) * np.cos(y_rad)), axis=-1)
+    target = rng[:, None] * np.stack((np.sin(az_rad) * np.cos(el_rad), np.cos(az_rad) * np.cos(el_rad), np.sin(el_rad)), axis=-1)
+    assert np.abs(np.cross(target - axis, boresight)).max() < 1e-8
+    assert np.all(np.sum((target - axis) * boresight, axis=-1) > 0.0)
+    assert np.allclose(x, azel_to_xy_array(az, el)[0])
+
+def test_round_trip(targets):
+    """Test x, y and the range convert back to the same az, el."""
+    az, el, rng = targets
+    model = OffsetAxisModel()
+    back_az, back_el = model.xy_to_azel(*model.azel_to_xy(az, el, rng), rng)
+    assert np.abs((back_az - az + 180.0) % 360.0 - 180.0).max() < 1e-9
+    assert np.abs(back_el - el).max() < 1e-9
+    assert np.isnan(model.xy_to_azel(0.0, 45.0, Y_OFFSET / 2)[1])
+
+def test_parallax(targets):
+    """Test the parallax is about atan(offset / range) at most and fades with range."""
+    az, el, _ = targets
+    model = OffsetAxisModel()
+    near = np.abs(model.parallax(az, el, 1000.0))
+    assert near.max() == pytest.approx(np.degrees(Y_OFFSET / 1000.0), rel=1e-2)
+    assert np.abs(model.parallax(az, el, 1e6)).max() < 5e-4
+    x32, y32 = model.azel_to_xy(az, el, 1000.0, dtype=np.float32)
+    assert y32.dtype == np.float32
+
+if __name__ == "__main__":
+    pytest.main([__file__])
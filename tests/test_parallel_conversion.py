@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+from src.parallel_conversion import ParallelConverter, convert_parallel
+from src.pointing_conversion import azel_to_xy_array
+
+@pytest.fixture
+def azel():
+    """Fixture with random az/el samples."""
+    rng = np.random.default_rng(9)
+    return rng.uniform(0.0, 360.0, 10001), rng.uniform(0.0, 90.0, 10001)
+
+def test_convert_parallel(azel):
+    """Test the pool output matches the single process conversion, in order."""
+    az, el = azel
+    x, y = convert_parallel(az, el, workers=2, block_size=1000)
+    expected_x, expected_y = azel_to_xy_array(az, el)
+    assert np.array_equal(x, expected_x)
+    assert np.array_equal(y, expected_y)
+
+def test_converter_reuse(azel):
+    """Test one converter handles several calls, directions and sizes."""
+    az, el = azel
+    with ParallelConverter(workers=2, capacity=az.size, block_size=777) as converter:
+        x, y = converter.convert(az, el)
+        back_az, back_el = converter.convert(x, y, 'xy2azel')
+        assert np.allclose(back_az, az)
+        assert np.allclose(back_el, el)
+        x, y = converter.convert(az[:10], el[:10])
+        assert x.size == 10
+        assert np.array_equal((x, y), azel_to_xy_array(az[:10], el[:10]))
+
+def test_converter_limits(azel):
+    """Test oversized and mismatched inputs are rejected."""
+    az, el = azel
+    with ParallelConverter(workers=1, capacity=100) as converter:
+        with pytest.raises(ValueError):
+            converter.convert(az, el)
+        with pytest.raises(ValueError):
+            converter.convert(az[:10], el[:11])
+        with pytest.raises(ValueError):
+            converter.convert(az[:10], el[:10], 'unknown')
+
+if __name__ == "__main__":
+    pytest.main([__file__])
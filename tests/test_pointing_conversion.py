@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-from src.pointing_conversion import ENU
+from src.pointing_conversion import ENU, ENUBatch, FLOAT32_ERROR, azel_to_xy, xy_to_azel, azel_to_xy_array, xy_to_azel_array, rpy_matrix
 
 @pytest.fixture
 def enu():
@@ -73,6 +73,20 @@ def test_r_rpy(enu):
     enu.R_rpy(0, 0, 0)
     assert np.allclose(enu.vector, np.array([1.0, 0.0, 0.0]))
 
+def test_rpy_matrix():
+    """Test the roll, pitch, yaw matrix is a rotation built from the single axis matrices."""
+    for angles in [(1.0, 0.0, 0.0), (0.0, 2.0, 0.0), (0.0, 0.0, 3.0), (1.5, -2.5, 30.0)]:
+        matrix = rpy_matrix(*angles)
+        assert np.allclose(matrix @ matrix.T, np.eye(3))
+        assert np.isclose(np.linalg.det(matrix), 1.0)
+        psi, phi, theta = angles
+        assert np.allclose(matrix, ENU._up_matrix(theta) @ ENU._east_matrix(phi) @ ENU._north_matrix(psi))
+    enu = ENU(azel=(30.0, 40.0))
+    vector = enu.vector
+    assert np.allclose(enu.R_rpy(1.5, -2.5, 30.0), rpy_matrix(1.5, -2.5, 30.0))
+    assert np.allclose(enu.vector, vector @ rpy_matrix(1.5, -2.5, 30.0))
+    assert np.isclose(np.linalg.norm(enu.vector), 1.0)
+
 def test_update_state(enu):
     """Test the update_state method."""
     enu.vector = np.array([1, 1, 1])
@@ -87,6 +101,24 @@ def test_update_state(enu):
     assert np.isclose(enu.y, 90.0)
     assert np.isclose(enu.z, 45.0)
 
+def test_lazy_state_invalidation():
+    """Test the cached derived values follow changes to the vector."""
+    enu = ENU(azel=(90.0, 45.0))
+    assert np.allclose(enu.xy, (45.0, 0.0))
+    enu.from_azel(180.0, 45.0)
+    assert np.allclose(enu.xy, (0.0, -45.0))
+    enu.R_up(90.0)
+    assert np.isclose(enu.az, 270.0)
+    enu.vector = np.array([0, 0, 1])
+    assert np.isclose(enu.el, 90.0)
+
+def test_slots():
+    """Test the ENU objects do not carry an instance dictionary."""
+    enu = ENU()
+    assert not hasattr(enu, '__dict__')
+    with pytest.raises(AttributeError):
+        enu.not_an_attribute = 1.0
+
 def test_string():
     enu = ENU(azel=(90.0, 45.0))
     assert str(enu) == "azel:(90.000, 45.000), xy:(45.000, 0.000), vect:[0.707, 0.000, 0.707]"
@@ -95,5 +127,100 @@ def test_repr():
     enu = ENU(azel=(45.0, 90.0))
     assert repr(enu) == "ENU(azel=(45.0, 90.0))"
 
+@pytest.fixture
+def azel_grid():
+    """Fixture with an az/el grid that includes the zero valued special cases."""
+    az, el = np.meshgrid(np.arange(0.0, 360.0, 15.0), np.array([0.0, 1.0, 30.0, 45.0, 60.0, 89.0, 90.0]))
+    return az.ravel(), el.ravel()
+
+def test_batch_from_azel(azel_grid):
+    """Test the batch az/el path against the scalar ENU.from_azel path."""
+    az, el = azel_grid
+    batch = ENUBatch.from_azel(az, el)
+    assert len(batch) == az.size
+    for i in range(az.size):
+        enu = ENU(azel=(az[i], el[i]))
+        assert np.allclose(batch.vector[i], enu.vector)
+        assert np.isclose(batch.az[i], enu.az)
+        assert np.isclose(batch.el[i], enu.el)
+        assert np.isclose(batch.x[i], enu.x)
+        assert np.isclose(batch.y[i], enu.y)
+
+def test_batch_from_xy():
+    """Test the batch x/y path against the scalar ENU.from_xy path."""
+    x, y = np.meshgrid(np.arange(-90.0, 91.0, 15.0), np.arange(-90.0, 91.0, 15.0))
+    x, y = x.ravel(), y.ravel()
+    batch = ENUBatch.from_xy(x, y)
+    for i in range(x.size):
+        enu = ENU(xy=(x[i], y[i]))
+        assert np.allclose(batch.vector[i], enu.vector)
+        assert np.isclose(batch.az[i], enu.az)
+        assert np.isclose(batch.el[i], enu.el)
+        assert np.isclose(batch.x[i], enu.x)
+        assert np.isclose(batch.y[i], enu.y)
+
+def test_batch_from_enu():
+    """Test the batch ENU path, zero vectors are left unnormalized."""
+    batch = ENUBatch.from_enu([1, 0, 0], [1, 1, 0], [1, 0, 0])
+    assert np.allclose(batch.vector[0], np.array([1, 1, 1]) / np.sqrt(3.0))
+    assert np.allclose(batch.vector[1], [0, 1, 0])
+    assert np.allclose(batch.vector[2], [0, 0, 0])
+    assert np.isclose(batch.az[0], 45.0)
+
+def test_batch_2d():
+    """Test meshgrid inputs keep their shape and match the closed form conversions."""
+    az, el = np.meshgrid(np.arange(0.0, 360.0, 90.0), np.array([10.0, 60.0]))
+    batch = ENUBatch.from_azel(az, el)
+    assert len(batch) == 8
+    assert batch.x.shape == az.shape
+    assert np.allclose(batch.xy, azel_to_xy_array(az, el))
+    batch = ENUBatch.from_xy(*azel_to_xy_array(az, el))
+    assert np.allclose(batch.el, el)
+
+def test_closed_form_azel_to_xy():
+    """Property test, the closed form az/el -> x/y matches the rotation matrix path."""
+    rng = np.random.default_rng(1962)
+    az = rng.uniform(0.0, 360.0, 500)
+    el = rng.uniform(0.0, 90.0, 500)
+    x, y = azel_to_xy_array(az, el)
+    for i in range(az.size):
+        enu = ENU(azel=(az[i], el[i]))
+        assert np.allclose(azel_to_xy(az[i], el[i]), enu.xy)
+        assert np.allclose((x[i], y[i]), enu.xy)
+
+def test_closed_form_xy_to_azel():
+    """Property test, the closed form x/y -> az/el matches the rotation matrix path."""
+    rng = np.random.default_rng(1980)
+    x = rng.uniform(-90.0, 90.0, 500)
+    y = rng.uniform(-90.0, 90.0, 500)
+    az, el = xy_to_azel_array(x, y)
+    for i in range(x.size):
+        enu = ENU(xy=(x[i], y[i]))
+        assert np.allclose(xy_to_azel(x[i], y[i]), enu.azel)
+        assert np.allclose((az[i], el[i]), enu.azel)
+
+@pytest.mark.parametrize("azel,xy", [((0, 0), (0,90)), ((90, 45), (45, 0)), ((180, 45), (0, -45)), ((270, 45), (-45,0)), ((0, 45), (0,45))])
+def test_closed_form_known_values(azel, xy):
+    """Test the closed form functions with the known init values."""
+    assert np.allclose(azel_to_xy(*azel), xy)
+    assert np.allclose(xy_to_azel(*xy), azel)
+
+def test_float32_envelope():
+    """Test the float32 conversions stay inside the documented envelope away from the keyholes and the zenith."""
+    rng = np.random.default_rng(32)
+    az, el = rng.uniform(0.0, 360.0, 200000), rng.uniform(5.0, 85.0, 200000)
+    x, y = azel_to_xy_array(az, el)
+    x32, y32 = azel_to_xy_array(az, el, np.float32)
+    assert x32.dtype == y32.dtype == np.float32
+    assert np.abs(x32 - x).max() <= FLOAT32_ERROR and np.abs(y32 - y).max() <= FLOAT32_ERROR
+    az64, el64 = xy_to_azel_array(x, y)
+    az32, el32 = xy_to_azel_array(x, y, np.float32)
+    assert az32.dtype == np.float32
+    assert (np.abs((az32 - az64 + 180.0) % 360.0 - 180.0) * np.cos(np.radians(el64))).max() <= FLOAT32_ERROR
+    assert np.abs(el32 - el64).max() <= FLOAT32_ERROR
+    batch = ENUBatch.from_azel(az[:1000], el[:1000], dtype=np.float32)
+    assert batch.vector.dtype == batch.x.dtype == np.float32
+    assert np.abs(batch.y - y[:1000]).max() <= FLOAT32_ERROR
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+from src.data_generator import DataGen
+from src.reachability_mask import BOUNDARY, INSIDE, OUTSIDE, ReachabilityMask
+from src.visibility import VisibilityChecker
+
+POLYGON = [(-60, -60), (60, -60), (60, 60), (0, 75), (-60, 60)]
+
+@pytest.fixture(scope="module")
+def masks():
+    """Fixture with coarse rectangle and polygon masks to keep the builds quick."""
+    return ReachabilityMask(step=1.0), ReachabilityMask(polygon=POLYGON, step=1.0)
+
+def test_matches_exact(masks):
+    """Test random points, including below the horizon, get the exact answer."""
+    rng = np.random.default_rng(23)
+    az, el = rng.uniform(0.0, 360.0, 200000), rng.uniform(-5.0, 90.0, 200000)
+    for mask in masks:
+        assert np.array_equal(mask.contains(az, el), mask.checker.margin(az, el) >= 0.0)
+        stats = mask.stats()
+        assert stats['boundary'] < 0.1
+        assert stats['inside'] + stats['outside'] + stats['boundary'] == pytest.approx(1.0)
+
+def test_near_the_contour(masks):
+    """Test points straddling the limit contour, where every answer comes from the exact fallback."""
+    datagen = DataGen()
+    datagen.find_limits(0.5, "vectorized")
+    az = np.repeat(datagen.contour[:, 0], 11)
+    el = (datagen.contour[:, 1, None] + np.linspace(-0.2, 0.2, 11)).ravel()
+    mask = masks[0]
+    assert np.array_equal(mask.contains(az, el), VisibilityChecker(el_min=None).margin(az, el) >= 0.0)
+    assert np.all(mask.lookup(datagen.contour[:, 0], datagen.contour[:, 1]) == BOUNDARY)
+    assert mask.lookup(0.0, 45.0) == INSIDE
+    assert mask.lookup(90.0, 0.5) == OUTSIDE
+
+def test_save_load(masks, tmp_path):
+    """Test a saved mask loads memory mapped with its limit geometry."""
+    mask = masks[1]
+    path = str(tmp_path / 'mask.npy')
+    mask.save(path)
+    loaded = ReachabilityMask.load(path)
+    assert isinstance(loaded.data, np.memmap)
+    assert loaded.polygon == [tuple(map(float, vertex)) for vertex in POLYGON]
+    assert np.array_equal(loaded.states, mask.states)
+    cached = ReachabilityMask.cached(str(tmp_path / 'masks'), step=2.0)
+    assert ReachabilityMask.cached(str(tmp_path / 'masks'), step=2.0).xy == cached.xy == ((-86.0, 86.0), (-76.0, 76.0))
+    assert len(list((tmp_path / 'masks').glob('*.npy'))) == 1
+
+def test_datagen_mask():
+    """Test DataGen compiles its own limits."""
+    datagen = DataGen(((-80.0, 80.0), (-70.0, 70.0)))
+    assert datagen.reachability_mask(step=2.0).xy == ((-80.0, 80.0), (-70.0, 70.0))
+    assert datagen.reachability_mask("polygon", step=2.0).polygon == [tuple(map(float, v)) for v in datagen.legacy_lims]
+    with pytest.raises(ValueError):
+        datagen.reachability_mask("unknown")
+    with pytest.raises(ValueError):
+        ReachabilityMask(step=0.0)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+from src.slew_analysis import xy_rates, find_violations, analyze_track, screen_tracks, Violation
+
+def overhead_pass(max_el, duration=600.0, samples=6001, az_center=180.0):
+    """A simple great circle like pass, az sweeps 180 degrees while el rises and sets."""
+    t = np.linspace(0.0, duration, samples)
+    phase = t / duration
+    az = (az_center - 90.0 + 180.0 * phase) % 360.0
+    el = max_el * np.sin(np.pi * phase) + 0.5
+    return t, az, el
+
+def test_methods_agree():
+    """Test the Jacobian rates match differentiating x and y directly."""
+    t, az, el = overhead_pass(60.0)
+    jacobian = xy_rates(t, az, el, 'jacobian')
+    gradient = xy_rates(t, az, el, 'gradient')
+    inner = slice(5, -5)
+    for key in ('x_rate', 'y_rate'):
+        assert np.allclose(jacobian[key][inner], gradient[key][inner], rtol=1e-3, atol=1e-4)
+    for key in ('x_accel', 'y_accel'):
+        assert np.allclose(jacobian[key][inner], gradient[key][inner], rtol=1e-2, atol=1e-3)
+
+def test_constant_x_motion():
+    """Test a track along y = 20 at a constant x rate, clear of the az/el zenith singularity."""
+    t = np.linspace(0.0, 100.0, 1001)
+    x = -50.0 + t
+    from src.pointing_conversion import xy_to_azel_array
+    az, el = xy_to_azel_array(x, np.full_like(x, 20.0))
+    rates = xy_rates(t, az, el)
+    assert np.allclose(rates['x_rate'][1:-1], 1.0, atol=1e-3)
+    assert np.allclose(rates['y_rate'][1:-1], 0.0, atol=1e-3)
+
+def test_keyhole_violations():
+    """Test a pass near the north horizon keyhole needs a far larger x rate than a high pass."""
+    high = analyze_track(*overhead_pass(80.0), max_rate=(2.0, 2.0))
+    low = analyze_track(*overhead_pass(3.0, az_center=0.0), max_rate=(2.0, 2.0))
+    assert np.abs(low[0]['x_rate']).max() > 5 * np.abs(high[0]['x_rate']).max()
+    assert high[1] == []
+    assert low[1]
+    violation = low[1][0]
+    assert isinstance(violation, Violation)
+    assert violation.axis == 'x' and violation.kind == 'rate'
+    assert violation.peak > 2.0
+    assert violation.start_time <= violation.stop_time
+
+def test_find_violations_runs():
+    """Test runs over the limit, including non finite values, are reported once each."""
+    t = np.arange(8.0)
+    rates = {'x_rate': np.array([0, 3, 3, 0, 0, np.inf, 0, 3.0]), 'y_rate': np.zeros(8),
+             'x_accel': np.zeros(8), 'y_accel': np.array([0, 0, 0, 0, 9.0, 0, 0, 0])}
+    violations = find_violations(t, rates, (2.0, 2.0), (1.0, 1.0))
+    assert [(v.axis, v.kind, v.start, v.stop) for v in violations] == [
+        ('x', 'rate', 1, 2), ('y', 'accel', 4, 4), ('x', 'rate', 5, 5), ('x', 'rate', 7, 7)]
+
+def test_screen_tracks():
+    """Test only passes with violations are returned."""
+    tracks = {'high': overhead_pass(80.0), 'low': overhead_pass(3.0, az_center=0.0)}
+    screened = screen_tracks(tracks, max_rate=(2.0, 2.0))
+    assert list(screened) == ['low']
+
+def test_bad_input():
+    with pytest.raises(ValueError):
+        xy_rates(np.arange(3.0), np.arange(4.0), np.arange(3.0))
+    with pytest.raises(ValueError):
+        xy_rates(np.arange(3.0), np.arange(3.0), np.arange(3.0), 'unknown')
+
+if __name__ == "__main__":
+    pytest.main([__file__])
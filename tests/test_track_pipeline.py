@@ -0,0 +1,123 @@
+import csv
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+from src.track_pipeline import convert_chunk, convert_track, read_chunks, main
+from src.pointing_conversion import ENUBatch
+
+@pytest.fixture
+def track(tmp_path):
+    """Fixture writing a small az/el track CSV."""
+    rng = np.random.default_rng(8)
+    az = rng.uniform(0.0, 360.0, 1000)
+    el = rng.uniform(1.0, 89.0, 1000)
+    path = tmp_path / 'track.csv'
+    with open(path, 'w', newline='') as track_file:
+        writer = csv.writer(track_file)
+        writer.writerow(['time', 'az', 'el'])
+        for i in range(az.size):
+            writer.writerow([f"2026-10-16T00:{i // 60:02d}:{i % 60:02d}", repr(float(az[i])), repr(float(el[i]))])
+    return path, az, el
+
+def read_csv(path):
+    with open(path, newline='') as csv_file:
+        rows = list(csv.reader(csv_file))
+    return rows[0], rows[1:]
+
+def test_convert_chunk():
+    """Test the chunk conversion matches ENUBatch."""
+    az = np.array([0.0, 90.0, 180.0, 270.0])
+    el = np.array([0.0, 45.0, 45.0, 45.0])
+    x, y = convert_chunk(az, el)
+    batch = ENUBatch.from_azel(az, el)
+    assert np.allclose(x, batch.x)
+    assert np.allclose(y, batch.y)
+    with pytest.raises(ValueError):
+        convert_chunk(az, el, 'unknown')
+
+def test_read_chunks(track):
+    """Test the reader never yields more than a chunk of rows."""
+    path, az, _ = track
+    sizes = [chunk[0].shape[0] for chunk in read_chunks(str(path), ('time', 'az', 'el'), 300)]
+    assert sizes == [300, 300, 300, 100]
+
+def test_convert_track_round_trip(track, tmp_path):
+    """Test az/el -> x/y -> az/el through files with different chunk sizes."""
+    path, az, el = track
+    xy_path = tmp_path / 'xy.csv'
+    assert convert_track(str(path), str(xy_path), chunk_size=128) == az.size
+    header, rows = read_csv(xy_path)
+    assert header == ['time', 'az', 'el', 'x', 'y']
+    assert rows[0][0] == "2026-10-16T00:00:00"
+    azel_path = tmp_path / 'azel.csv'
+    convert_track(str(xy_path), str(azel_path), 'xy2azel', chunk_size=1000, columns=('time', 'x', 'y'))
+    header, rows = read_csv(azel_path)
+    assert header == ['time', 'x', 'y', 'az', 'el']
+    values = np.array([row[3:] for row in rows], dtype=np.double)
+    assert np.allclose(values[:, 0], az)
+    assert np.allclose(values[:, 1], el)
+
+def test_convert_track_workers(track, tmp_path):
+    """Test the process pool option writes the same file as one process."""
+    path, _, _ = track
+    serial_path = tmp_path / 'serial.csv'
+    parallel_path = tmp_path / 'parallel.csv'
+    convert_track(str(path), str(serial_path), chunk_size=300)
+    convert_track(str(path), str(parallel_path), chunk_size=300, workers=2)
+    assert serial_path.read_text() == parallel_path.read_text()
+
+def test_workers_as_package(track, tmp_path):
+    """Test the process pool option imported as src.track_pipeline, without src on sys.path."""
+    path, _, _ = track
+    code = ("import sys; from src.track_pipeline import convert_track; "
+            "convert_track(sys.argv[1], sys.argv[2], chunk_size=300, workers=2); "
+            "print(sorted(m for m in ('track_pipeline', 'parallel_conversion', 'pointing_conversion') if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {key: value for key, value in os.environ.items() if key != 'PYTHONPATH'}
+    result = subprocess.run([sys.executable, '-c', code, str(path), str(tmp_path / 'out.csv')], cwd=root, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+    assert (tmp_path / 'out.csv').exists()
+
+def test_missing_columns(track, tmp_path):
+    """Test a missing input column is reported."""
+    path, _, _ = track
+    with pytest.raises(ValueError):
+        convert_track(str(path), str(tmp_path / 'out.csv'), 'xy2azel')
+
+def test_blank_and_short_rows(tmp_path):
+    """Test blank lines are skipped and a short row names its line without leaving an output file."""
+    path = tmp_path / 'blank.csv'
+    path.write_text("time,az,el\n0,10,20\n\n1,30,40\n\n")
+    assert convert_track(str(path), str(tmp_path / 'out.csv')) == 2
+    _, rows = read_csv(tmp_path / 'out.csv')
+    assert [row[0] for row in rows] == ['0', '1']
+    path.write_text("time,az,el\n0,10,20\n1,30\n")
+    with pytest.raises(ValueError, match="line 3"):
+        convert_track(str(path), str(tmp_path / 'short.csv'), chunk_size=1)
+    assert not os.path.exists(tmp_path / 'short.csv')
+
+def test_parquet(track, tmp_path):
+    """Test CSV -> Parquet -> CSV."""
+    pytest.importorskip('pyarrow')
+    path, az, el = track
+    parquet_path = tmp_path / 'xy.parquet'
+    convert_track(str(path), str(parquet_path), chunk_size=256)
+    csv_path = tmp_path / 'azel.csv'
+    assert convert_track(str(parquet_path), str(csv_path), 'xy2azel', chunk_size=100, columns=('time', 'x', 'y')) == az.size
+    _, rows = read_csv(csv_path)
+    values = np.array([row[3:] for row in rows], dtype=np.double)
+    assert np.allclose(values[:, 0], az)
+    assert np.allclose(values[:, 1], el)
+
+def test_main(track, tmp_path, capsys):
+    """Test the command line entry point."""
+    path, az, _ = track
+    out_path = tmp_path / 'xy.csv'
+    assert main([str(path), str(out_path), '--chunk-size', '500']) == 0
+    assert f"converted {az.size} rows" in capsys.readouterr().out
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+from src.visibility import VisibilityChecker
+from src.pointing_conversion import xy_to_azel_array
+
+LEGACY = [(86, 61), (77, 61), (77, 71), (57, 71), (57, 74), (-57, 74), (-57, 71), (-77, 71), (-77, 61), (-86, 61), (-86, -64), (-71, -64), (-71, -71), (71, -71), (71, -64), (86, -64)]
+
+def x_sweep(x_start=-100.0, x_stop=100.0, y=0.0, samples=2001):
+    """A track moving along x at 1 deg/s, as az/el."""
+    t = np.linspace(0.0, x_stop - x_start, samples)
+    x = x_start + t
+    az, el = xy_to_azel_array(x, np.full_like(x, y))
+    return t, az, el
+
+def test_crossing_times():
+    """Test the interpolated crossings land on the x limits."""
+    checker = VisibilityChecker(el_min=None)
+    intervals = checker.intervals(*x_sweep())
+    assert len(intervals) == 1
+    start, stop = intervals[0]
+    assert start == pytest.approx(100.0 - 86.0, abs=1e-6)
+    assert stop == pytest.approx(100.0 + 86.0, abs=1e-6)
+
+def test_elevation_mask():
+    """Test the elevation mask trims a track that is inside the x/y limits."""
+    checker = VisibilityChecker(((-89.0, 89.0), (-89.0, 89.0)), el_min=10.0)
+    start, stop = checker.intervals(*x_sweep(-88.0, 88.0))[0]
+    assert start == pytest.approx(88.0 - 80.0, abs=1e-3)
+    assert stop == pytest.approx(88.0 + 80.0, abs=1e-3)
+
+def test_polygon_steps():
+    """Test a track above the legacy polygon corner steps crosses at the step edges."""
+    checker = VisibilityChecker(polygon=LEGACY, el_min=None)
+    intervals = checker.intervals(*x_sweep(y=66.0))
+    assert len(intervals) == 1
+    assert intervals[0][0] == pytest.approx(100.0 - 77.0, abs=1e-6)
+    assert intervals[0][1] == pytest.approx(100.0 + 77.0, abs=1e-6)
+    start, stop = checker.intervals(*x_sweep(y=72.5))[0]
+    assert (start, stop) == (pytest.approx(100.0 - 57.0, abs=1e-6), pytest.approx(100.0 + 57.0, abs=1e-6))
+
+def test_edges_of_track():
+    """Test tracks that start or end inside the limits."""
+    checker = VisibilityChecker(el_min=None)
+    t, az, el = x_sweep(-50.0, 50.0)
+    assert checker.intervals(t, az, el) == [(0.0, 100.0)]
+    t, az, el = x_sweep(88.0, 95.0)
+    assert checker.intervals(t, az, el) == []
+
+def test_screen_matches_intervals():
+    """Test one screen call gives the same answers as each track alone."""
+    checker = VisibilityChecker(polygon=LEGACY)
+    tracks = {'a': x_sweep(y=66.0), 'b': x_sweep(y=-10.0, samples=301), 'c': x_sweep(88.0, 95.0), 'd': (np.array([]), np.array([]), np.array([]))}
+    screened = checker.screen(tracks)
+    assert list(screened) == list(tracks)
+    for name, track in tracks.items():
+        assert screened[name] == checker.intervals(*track)
+    assert checker.screen({}) == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__])